@@ -11,15 +11,40 @@ DASHBOARD WEB V2 - Monitoramento Completo
 import os
 import json
 import time
+import zlib
+import pickle
+import hashlib
 import threading
 from datetime import datetime, timedelta
-from flask import Flask, render_template_string, jsonify, request
-from collections import defaultdict
+from flask import Flask, Response, request
+from collections import defaultdict, deque
+from functools import lru_cache
+
+# Serialização JSON rápida (fallback: json da stdlib)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Servidor WSGI multi-thread (fallback: servidor de desenvolvimento do Flask)
+try:
+    from waitress import serve
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
 
 # Configuração
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DASHBOARD_PORT = 8080
-HISTORY_FILE = os.path.join(BASE_DIR, 'dashboard_history.json')
+DASHBOARD_THREADS = 8
+HISTORY_FILE = os.path.join(BASE_DIR, 'dashboard_history.pkl')
+LEGACY_HISTORY_FILE = os.path.join(BASE_DIR, 'dashboard_history.json')  # migração
+LOCAL_STATE_FILE = os.path.join(BASE_DIR, 'session_state.json')
+LOCAL_POLL_INTERVAL = 2  # segundos entre leituras do estado local
+PROFIT_WINDOWS = (2, 6, 12, 24)  # horas
+HISTORICO_STATUS_MAX = 500  # pontos de historico_saldo mantidos/enviados em /api/status
+GATILHOS_STATUS_MAX = 20  # ultimos_gatilhos mantidos/enviados em /api/status
 
 # Carregar configuração
 DASHBOARD_CONFIG = {}
@@ -45,6 +70,20 @@ historical_data = {
     'isolada': {'saldo_history': [], 'gatilhos_history': [], 'low_sequences': [], 'start_date': None, 'initial_deposit': 0, 'initial_bet': 0},
 }
 
+# Campos de machines_state enviados em /api/status (demais são calculados)
+FIELDS_TO_SEND = (
+    'saldo', 'deposito_inicial', 'aposta_base', 'modo', 'nivel',
+    'sessoes_win', 'sessoes_loss', 'total_rodadas',
+    'ultimos_gatilhos', 'last_mult', 'last_mult_time',
+)
+
+# Campos copiados direto do POST de /api/update (campo, valor padrão);
+# os demais (saldo, modo, depósito, aposta base, gatilhos) são tratados à parte
+UPDATE_FIELDS = (
+    ('nivel', 10), ('sessoes_win', 0), ('sessoes_loss', 0), ('total_rodadas', 0),
+    ('uptime_start', None), ('last_mult', None), ('last_mult_time', None),
+)
+
 # Estado atual das máquinas
 machines_state = {
     'agressiva': {'status': 'offline', 'saldo': 0, 'deposito_inicial': 0, 'modo': 'g6_ns10', 'nivel': 10,
@@ -64,23 +103,102 @@ machines_state = {
 app = Flask(__name__)
 
 
+def _dumps(obj):
+    """Serializa obj para bytes JSON (orjson quando disponível)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, default=str).encode('utf-8')
+
+
+def jsonify_fast(obj, status=200, headers=None):
+    """Equivalente a flask.jsonify usando _dumps"""
+    return app.response_class(_dumps(obj), status=status, headers=headers,
+                              mimetype='application/json')
+
+# mtime do último session_state.json processado (evita reler arquivo inalterado)
+_local_state_mtime = None
+
+# Cache incremental do histórico de saldo da máquina local
+_local_cache = {
+    'last_entry': None,
+    'deposito': None,
+    'saldo_acum': None,
+    'historico_saldo': [],
+}
+
+# Séries historico_saldo: cada ponto recebe 'ts' (epoch de chegada) para que
+# o cliente peça só o que mudou via /api/status?since=<ts>.
+_historico_lock = threading.Lock()
+_historico_saldo_reset = {'agressiva': 0.0, 'conservadora': 0.0, 'isolada': 0.0}
+
+# Séries completas (historico_saldo + ultimos_gatilhos) em JSON comprimido com zlib;
+# só são descomprimidas quando alguém pede /api/history/<machine_id>
+_historico_arquivo = {'agressiva': None, 'conservadora': None, 'isolada': None}
+
+# Janelas móveis (ts_epoch, saldo) por máquina/período para lucro em O(1).
+# Ficam fora de historical_data para não irem para o JSON persistido.
+_janelas_lock = threading.Lock()
+_profit_windows = {m: {h: deque() for h in PROFIT_WINDOWS} for m in historical_data}
+
+
 def load_history():
-    """Carrega histórico persistente do arquivo"""
+    """Carrega histórico persistente do arquivo (pickle; JSON antigo como fallback)"""
     global historical_data
     if os.path.exists(HISTORY_FILE):
         try:
-            with open(HISTORY_FILE, 'r') as f:
-                historical_data = json.load(f)
+            with open(HISTORY_FILE, 'rb') as f:
+                historical_data = pickle.load(f)
             print(f"[DASHBOARD] Histórico carregado: {HISTORY_FILE}")
         except Exception as e:
             print(f"[DASHBOARD] Erro ao carregar histórico: {e}")
+    elif os.path.exists(LEGACY_HISTORY_FILE):
+        try:
+            with open(LEGACY_HISTORY_FILE, 'r') as f:
+                historical_data = json.load(f)
+            print(f"[DASHBOARD] Histórico carregado: {LEGACY_HISTORY_FILE}")
+        except Exception as e:
+            print(f"[DASHBOARD] Erro ao carregar histórico: {e}")
+
+    for machine_id in historical_data:
+        _reconstruir_janelas(machine_id)
+
+
+def _podar_janela(janela, hours, agora):
+    """Remove do início da janela as amostras anteriores ao corte"""
+    cutoff = agora - hours * 3600
+    while janela and janela[0][0] < cutoff:
+        janela.popleft()
+
+
+def _reconstruir_janelas(machine_id, horas=PROFIT_WINDOWS):
+    """Recria as janelas móveis (existentes + horas) a partir do saldo_history"""
+    agora = time.time()
+    amostras = [
+        (datetime.fromisoformat(h['timestamp']).timestamp(), h['saldo'])
+        for h in historical_data[machine_id]['saldo_history']
+    ]
+    with _janelas_lock:
+        janelas = _profit_windows.setdefault(machine_id, {})
+        for hours in set(horas) | set(janelas):
+            janelas[hours] = deque(amostras)
+            _podar_janela(janelas[hours], hours, agora)
+
+
+def _registrar_amostra(machine_id, ts, saldo):
+    """Empurra uma amostra de saldo em todas as janelas da máquina"""
+    with _janelas_lock:
+        for hours, janela in _profit_windows[machine_id].items():
+            janela.append((ts, saldo))
+            _podar_janela(janela, hours, ts)
 
 
 def save_history():
-    """Salva histórico persistente no arquivo"""
+    """Salva histórico persistente no arquivo (escrita atômica via rename)"""
     try:
-        with open(HISTORY_FILE, 'w') as f:
-            json.dump(historical_data, f, indent=2, default=str)
+        tmp_file = HISTORY_FILE + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(historical_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, HISTORY_FILE)
     except Exception as e:
         print(f"[DASHBOARD] Erro ao salvar histórico: {e}")
 
@@ -109,13 +227,17 @@ def update_historical_data(machine_id, data):
             'timestamp': timestamp,
             'saldo': saldo
         })
+        _registrar_amostra(machine_id, time.time(), saldo)
 
     # Manter apenas últimos 7 dias de dados (para não crescer infinitamente)
+    # A lista é cronológica: basta avançar pelo início até o primeiro ponto válido
     cutoff = datetime.now() - timedelta(days=7)
-    hist['saldo_history'] = [
-        h for h in hist['saldo_history']
-        if datetime.fromisoformat(h['timestamp']) > cutoff
-    ]
+    saldo_history = hist['saldo_history']
+    inicio = 0
+    while inicio < len(saldo_history) and datetime.fromisoformat(saldo_history[inicio]['timestamp']) <= cutoff:
+        inicio += 1
+    if inicio:
+        del saldo_history[:inicio]
 
     # Atualizar sequências de baixos
     gatilhos = data.get('ultimos_gatilhos', [])
@@ -126,32 +248,43 @@ def update_historical_data(machine_id, data):
     save_history()
 
 
-def get_profit_by_period(machine_id, hours):
-    """Calcula lucro nos últimos X horas"""
+def get_profits_all_periods(machine_id, periods=PROFIT_WINDOWS):
+    """Calcula lucro de todos os períodos (horas) numa única passada
+
+    Retorna {hours: (lucro, pct)}; saldo de abertura via janela móvel.
+    """
     hist = historical_data[machine_id]['saldo_history']
     if not hist:
-        return 0, 0
+        return {hours: (0, 0) for hours in periods}
 
-    cutoff = datetime.now() - timedelta(hours=hours)
+    faltando = [h for h in periods if h not in _profit_windows[machine_id]]
+    if faltando:
+        _reconstruir_janelas(machine_id, faltando)
 
-    # Encontrar saldo no início do período
-    saldo_inicio = None
-    for h in hist:
-        ts = datetime.fromisoformat(h['timestamp'])
-        if ts >= cutoff:
-            saldo_inicio = h['saldo']
-            break
-
-    if saldo_inicio is None and hist:
-        saldo_inicio = hist[0]['saldo']
+    # Saldo no início do período = amostra mais antiga ainda na janela
+    agora = time.time()
+    inicios = {}
+    with _janelas_lock:
+        for hours in periods:
+            janela = _profit_windows[machine_id][hours]
+            _podar_janela(janela, hours, agora)
+            inicios[hours] = janela[0][1] if janela else hist[0]['saldo']
 
     saldo_atual = machines_state[machine_id].get('saldo', 0)
-    if saldo_inicio and saldo_atual:
-        lucro = saldo_atual - saldo_inicio
-        pct = (lucro / saldo_inicio * 100) if saldo_inicio > 0 else 0
-        return lucro, pct
+    lucros = {}
+    for hours, saldo_inicio in inicios.items():
+        if saldo_inicio and saldo_atual:
+            lucro = saldo_atual - saldo_inicio
+            pct = (lucro / saldo_inicio * 100) if saldo_inicio > 0 else 0
+            lucros[hours] = (lucro, pct)
+        else:
+            lucros[hours] = (0, 0)
+    return lucros
+
 
-    return 0, 0
+def get_profit_by_period(machine_id, hours):
+    """Calcula lucro nos últimos X horas"""
+    return get_profits_all_periods(machine_id, (hours,))[hours]
 
 
 def get_daily_average(machine_id):
@@ -237,18 +370,150 @@ def get_top_low_sequences(machine_id, limit=10, hours=None):
     return hist[:limit]
 
 
+@lru_cache(maxsize=128)
 def get_display_info(modo, machine_type):
-    """Retorna nome/cor baseado no modo"""
+    """Retorna nome/cor baseado no modo (memoizado: poucas combinações)"""
     if modo and 'ns9' in modo.lower():
         return {'name': 'AGRESSIVA', 'subtitle': f'{machine_type} - NS9', 'color': '#ff6b6b'}
     return {'name': 'CONSERVADORA', 'subtitle': f'{machine_type} - NS10', 'color': '#4ecdc4'}
 
 
+def _posicao_apos(lista, ultimo):
+    """Índice logo após a última ocorrência de `ultimo` em `lista` (busca do fim).
+
+    As listas recebidas são janelas deslizantes (o bot guarda as últimas 500
+    apostas): o item já processado costuma estar no fim, então a busca é curta.
+    Retorna None se o item não está mais na lista.
+    """
+    for i in range(len(lista) - 1, -1, -1):
+        if lista[i] == ultimo:
+            return i + 1
+    return None
+
+
+def _atualizar_historico_saldo(historico_apostas, deposito):
+    """Estende o histórico de saldo processando apenas as apostas novas.
+
+    A última aposta processada é localizada na lista atual (que pode ter
+    descartado apostas antigas) e só as seguintes entram. Reconstrói do zero
+    quando o depósito muda ou quando a última aposta processada sumiu da lista.
+    """
+    cache = _local_cache
+    agora = time.time()
+    inicio = None
+    if cache['deposito'] == deposito:
+        if cache['last_entry'] is None:
+            inicio = 0  # Nada processado ainda com este depósito
+        else:
+            inicio = _posicao_apos(historico_apostas, cache['last_entry'])
+    if inicio is None:
+        inicio = 0
+        cache['saldo_acum'] = deposito
+        cache['historico_saldo'] = []
+        cache['deposito'] = deposito
+        _historico_saldo_reset['agressiva'] = agora
+
+    saldo_acum = cache['saldo_acum']
+    historico_saldo = cache['historico_saldo']
+    for ap in historico_apostas[inicio:]:
+        saldo_acum += ap.get('resultado', 0)
+        historico_saldo.append({
+            'horario': ap.get('horario', ''),
+            'saldo': saldo_acum,
+            'ts': agora
+        })
+    # Mesmo tamanho da janela de apostas
+    if len(historico_saldo) > len(historico_apostas):
+        del historico_saldo[:len(historico_saldo) - len(historico_apostas)]
+
+    cache['saldo_acum'] = saldo_acum
+    cache['last_entry'] = historico_apostas[-1] if historico_apostas else None
+    return historico_saldo
+
+
+def _posicao_ponto_remoto(novo, atual):
+    """Índice em `novo` logo após o último ponto de `atual` (busca do fim), ou None.
+
+    A máquina remota recalcula a série inteira a partir da sua janela de
+    apostas: quando uma aposta antiga sai da janela, todos os saldos mudam.
+    Por isso o casamento é pelo horário do último ponto (e do penúltimo,
+    quando existe), não pelo saldo.
+    """
+    if not atual:
+        return None
+    ultimo = atual[-1].get('horario')
+    penultimo = atual[-2].get('horario') if len(atual) > 1 else None
+    for i in range(len(novo) - 1, -1, -1):
+        if novo[i].get('horario') == ultimo and (
+                penultimo is None or i == 0 or novo[i - 1].get('horario') == penultimo):
+            return i + 1
+    return None
+
+
+def _mesclar_historico_saldo(machine_id, novo):
+    """Incorpora o historico_saldo enviado por uma máquina remota.
+
+    Se a série recebida contém o último ponto atual, só os pontos seguintes
+    entram (carimbados com 'ts' e deslocados para continuar a série atual);
+    caso contrário a série é substituída e marcada como reset.
+    O estado guarda apenas os últimos HISTORICO_STATUS_MAX pontos.
+    O payload recebido não é alterado (pontos novos são cópias).
+    """
+    atual = machines_state[machine_id]['historico_saldo']
+    agora = time.time()
+    inicio = _posicao_ponto_remoto(novo, atual)
+    if inicio is not None:
+        delta = atual[-1].get('saldo', 0) - novo[inicio - 1].get('saldo', 0)
+        for p in novo[inicio:]:
+            atual.append({**p, 'saldo': p.get('saldo', 0) + delta, 'ts': agora})
+        if len(atual) > HISTORICO_STATUS_MAX:
+            del atual[:len(atual) - HISTORICO_STATUS_MAX]
+        return
+
+    machines_state[machine_id]['historico_saldo'] = [
+        {**p, 'ts': agora} for p in novo[-HISTORICO_STATUS_MAX:]
+    ]
+    _historico_saldo_reset[machine_id] = agora
+
+
+def _arquivar_historico(machine_id, historico_saldo, ultimos_gatilhos):
+    """Guarda as séries completas comprimidas para /api/history
+
+    Arquiva uma cópia limpa: 'ts' (carimbo de chegada usado só pelos deltas
+    de /api/status) é removido de todos os pontos, qualquer que seja a origem.
+    """
+    _historico_arquivo[machine_id] = zlib.compress(_dumps({
+        'historico_saldo': [
+            {k: v for k, v in p.items() if k != 'ts'} for p in historico_saldo
+        ],
+        'ultimos_gatilhos': ultimos_gatilhos,
+    }), 1)
+
+
+def _historico_desde(serie, since):
+    """Retorna os pontos com ts > since (série ordenada por ts)"""
+    i = len(serie)
+    while i > 0 and serie[i - 1].get('ts', 0) > since:
+        i -= 1
+    return serie[i:]
+
+
 def carregar_estado_local():
-    """Carrega estado da máquina local (Linux)"""
+    """Carrega estado da máquina local (Linux)
+
+    Só relê o arquivo quando o mtime muda; caso contrário apenas mantém
+    a máquina marcada como online.
+    """
+    global _local_state_mtime
     try:
-        state_file = os.path.join(BASE_DIR, 'session_state.json')
+        state_file = LOCAL_STATE_FILE
         if os.path.exists(state_file):
+            mtime = os.stat(state_file).st_mtime
+            if mtime == _local_state_mtime:
+                machines_state['agressiva']['last_update'] = datetime.now().isoformat()
+                update_historical_data('agressiva', machines_state['agressiva'])
+                return
+
             with open(state_file, 'r') as f:
                 state = json.load(f)
 
@@ -261,20 +526,15 @@ def carregar_estado_local():
             divisor = {9: 511, 10: 1023}.get(nivel, 1023)
             aposta_base = saldo / divisor if saldo > 0 else 0
 
-            # Construir histórico de saldo
+            # Construir histórico de saldo (incremental)
             historico_apostas = state.get('historico_apostas', [])
-            historico_saldo = []
-            saldo_acum = deposito
-            for ap in historico_apostas:
-                saldo_acum += ap.get('resultado', 0)
-                historico_saldo.append({
-                    'horario': ap.get('horario', ''),
-                    'saldo': saldo_acum
-                })
+            with _historico_lock:
+                historico_saldo = _atualizar_historico_saldo(historico_apostas, deposito)
+                machines_state['agressiva']['historico_saldo'] = historico_saldo[-HISTORICO_STATUS_MAX:]
 
             # Construir gatilhos
             ultimos = []
-            for h in historico_apostas[-20:]:
+            for h in historico_apostas[-GATILHOS_STATUS_MAX:]:
                 ultimos.append({
                     'tentativa': h.get('tentativa', 1),
                     'resultado': 'WIN' if h.get('ganhou', False) else 'LOSS',
@@ -296,7 +556,7 @@ def carregar_estado_local():
 
             machines_state['agressiva'].update({
                 'status': 'online',
-                'last_update': datetime.now(),
+                'last_update': datetime.now().isoformat(),
                 'saldo': saldo,
                 'deposito_inicial': deposito,
                 'aposta_base': aposta_base,
@@ -306,24 +566,44 @@ def carregar_estado_local():
                 'sessoes_loss': state.get('sessoes_loss', 0),
                 'total_rodadas': state.get('total_rodadas', 0),
                 'uptime_start': state.get('inicio_timestamp'),
-                'historico_saldo': historico_saldo,
                 'ultimos_gatilhos': ultimos,
                 'last_mult': last_mult,
                 'last_mult_time': last_mult_time,
             })
 
+            _arquivar_historico('agressiva', historico_saldo, ultimos)
             update_historical_data('agressiva', machines_state['agressiva'])
+            _local_state_mtime = mtime
 
     except Exception as e:
         print(f"[DASHBOARD] Erro ao carregar estado local: {e}")
 
 
+def _poll_local():
+    """Loop em background que mantém machines_state['agressiva'] atualizado"""
+    while True:
+        carregar_estado_local()
+        time.sleep(LOCAL_POLL_INTERVAL)
+
+
+def iniciar_poll_local():
+    """Inicia thread de leitura do estado local (daemon)"""
+    thread = threading.Thread(target=_poll_local, daemon=True)
+    thread.start()
+    return thread
+
+
+@lru_cache(maxsize=128)
+def _divisor_modo(modo):
+    """Divisor da aposta base para o modo (NS9: 511, demais: 1023)"""
+    return 511 if modo and 'ns9' in modo.lower() else 1023
+
+
 def calcular_aposta_base(saldo, modo):
     """Calcula aposta base"""
     if saldo <= 0:
         return 0
-    divisor = 511 if modo and 'ns9' in modo.lower() else 1023
-    return saldo / divisor
+    return saldo / _divisor_modo(modo)
 
 
 def get_machine_status(machine):
@@ -605,6 +885,26 @@ DASHBOARD_HTML = '''
 
     <script>
         let mainChart = null;
+        let lastStatusTs = 0;
+        let lastEtag = null;
+        const saldoBuffers = { agressiva: [], conservadora: [], isolada: [] };
+        const HISTORICO_STATUS_MAX = __HISTORICO_STATUS_MAX__;
+
+        function mergeSaldoHistory(data) {
+            Object.keys(saldoBuffers).forEach(key => {
+                const m = data[key];
+                const pontos = m.historico_saldo || [];
+                if (m.historico_saldo_completo) {
+                    saldoBuffers[key] = pontos;
+                } else {
+                    saldoBuffers[key].push(...pontos);
+                    const excesso = saldoBuffers[key].length - HISTORICO_STATUS_MAX;
+                    if (excesso > 0) saldoBuffers[key].splice(0, excesso);
+                }
+                m.historico_saldo = saldoBuffers[key];
+            });
+            lastStatusTs = data.t_now;
+        }
 
         function formatMoney(v) {
             return 'R$ ' + v.toLocaleString('pt-BR', {minimumFractionDigits: 2, maximumFractionDigits: 2});
@@ -878,9 +1178,16 @@ DASHBOARD_HTML = '''
 
         async function updateDashboard() {
             try {
-                const response = await fetch('/api/status');
+                const headers = lastEtag ? { 'If-None-Match': lastEtag } : {};
+                const response = await fetch('/api/status?since=' + lastStatusTs, { headers: headers, cache: 'no-store' });
+                if (response.status === 304) {
+                    document.getElementById('update-time').textContent = new Date().toLocaleTimeString('pt-BR');
+                    return;
+                }
+                lastEtag = response.headers.get('ETag');
                 const data = await response.json();
 
+                mergeSaldoHistory(data);
                 createMainChart(data);
 
                 document.getElementById('machines-grid').innerHTML =
@@ -905,25 +1212,83 @@ DASHBOARD_HTML = '''
 </html>
 '''
 
+# Template não usa Jinja: codifica uma vez e serve os bytes direto
+DASHBOARD_HTML_BYTES = DASHBOARD_HTML.replace(
+    '__HISTORICO_STATUS_MAX__', str(HISTORICO_STATUS_MAX)).encode('utf-8')
+
 
 @app.route('/')
 def dashboard():
-    return render_template_string(DASHBOARD_HTML)
+    return Response(DASHBOARD_HTML_BYTES, mimetype='text/html; charset=utf-8')
+
+
+def _calcular_metricas(key, machine):
+    """Métricas derivadas de historical_data para uma máquina"""
+    m = {}
+
+    # Dados históricos
+    hist = historical_data.get(key, {})
+    m['initial_deposit'] = hist.get('initial_deposit', machine.get('deposito_inicial', 0))
+    m['initial_bet'] = hist.get('initial_bet', machine.get('aposta_base', 0))
+
+    # Lucros por período
+    for hours, (lucro, pct) in get_profits_all_periods(key).items():
+        m[f'profit_{hours}h'] = {'lucro': lucro, 'pct': pct}
+
+    # Média diária
+    daily_avg, daily_pct = get_daily_average(key)
+    m['daily_avg'] = daily_avg
+    m['daily_avg_pct'] = daily_pct
+
+    # Top sequências de baixos
+    m['top_low_sequences'] = get_top_low_sequences(key, 10)
+    m['top_low_24h'] = get_top_low_sequences(key, 5, hours=24)
+    return m
+
+
+# Métricas calculadas no segundo corrente (agrupa polls simultâneos)
+_metricas_cache = {'segundo': None, 'dados': None}
+
+
+def get_metricas_historicas():
+    """Métricas de todas as máquinas, recalculadas no máximo 1x por segundo"""
+    segundo = int(time.time())
+    cache = _metricas_cache
+    if cache['segundo'] != segundo:
+        cache['dados'] = {key: _calcular_metricas(key, machine)
+                          for key, machine in machines_state.items()}
+        cache['segundo'] = segundo
+    return cache['dados']
 
 
 @app.route('/api/status')
 def api_status():
-    """Retorna status de todas as máquinas"""
-    carregar_estado_local()
-
+    """Retorna status de todas as máquinas
+
+    Com ?since=<t_now anterior>, historico_saldo traz só os pontos novos;
+    historico_saldo_completo indica quando o cliente deve substituir a série.
+    Responde 304 quando o If-None-Match bate com o ETag do conteúdo
+    (t_now e last_update não entram no ETag).
+    """
+    since = request.args.get('since', 0, type=float)
+    with _historico_lock:
+        t_now = time.time()
+        historicos = {}
+        for key, machine in machines_state.items():
+            completo = since < _historico_saldo_reset[key] or since <= 0
+            serie = machine['historico_saldo']
+            historicos[key] = (list(serie) if completo else _historico_desde(serie, since), completo)
+
+    metricas = get_metricas_historicas()
     result = {}
+    last_updates = {}
     for key, machine in machines_state.items():
-        m = machine.copy()
+        m = {field: machine.get(field) for field in FIELDS_TO_SEND}
+        m['historico_saldo'], m['historico_saldo_completo'] = historicos[key]
         m['status'] = get_machine_status(machine)
         m['uptime'] = calcular_uptime(machine.get('uptime_start'))
 
-        if m.get('last_update') and isinstance(m['last_update'], datetime):
-            m['last_update'] = m['last_update'].isoformat()
+        last_updates[key] = machine.get('last_update')
 
         # Display info baseado no modo
         if key != 'isolada':
@@ -941,35 +1306,26 @@ def api_status():
         # Lucro acumulado
         m['lucro_acumulado_anterior'] = DASHBOARD_CONFIG.get(key, {}).get('lucro_acumulado_anterior', 0) or 0
 
-        # Dados históricos
-        hist = historical_data.get(key, {})
-        m['initial_deposit'] = hist.get('initial_deposit', m.get('deposito_inicial', 0))
-        m['initial_bet'] = hist.get('initial_bet', m.get('aposta_base', 0))
-
-        # Lucros por período
-        for hours, label in [(2, '2h'), (6, '6h'), (12, '12h'), (24, '24h')]:
-            lucro, pct = get_profit_by_period(key, hours)
-            m[f'profit_{label}'] = {'lucro': lucro, 'pct': pct}
-
-        # Média diária
-        daily_avg, daily_pct = get_daily_average(key)
-        m['daily_avg'] = daily_avg
-        m['daily_avg_pct'] = daily_pct
-
-        # Top sequências de baixos
-        m['top_low_sequences'] = get_top_low_sequences(key, 10)
-        m['top_low_24h'] = get_top_low_sequences(key, 5, hours=24)
+        # Métricas históricas (lucros por período, média, sequências)
+        m.update(metricas[key])
 
         result[key] = m
 
-    return jsonify(result)
+    etag = hashlib.blake2b(_dumps(result), digest_size=8).hexdigest()
+    if request.headers.get('If-None-Match') == etag:
+        return Response(status=304, headers={'ETag': etag, 'Cache-Control': 'no-cache'})
+
+    for key, last_update in last_updates.items():
+        result[key]['last_update'] = last_update
+    result['t_now'] = t_now
+    return jsonify_fast(result, headers={'ETag': etag, 'Cache-Control': 'no-cache'})
 
 
 @app.route('/api/update/<machine_id>', methods=['POST'])
 def api_update(machine_id):
     """Recebe atualização de uma máquina remota"""
     if machine_id not in machines_state:
-        return jsonify({'error': 'Máquina não encontrada'}), 404
+        return jsonify_fast({'error': 'Máquina não encontrada'}, status=404)
 
     try:
         data = request.json
@@ -987,40 +1343,57 @@ def api_update(machine_id):
         if aposta_base == 0 and saldo > 0:
             aposta_base = calcular_aposta_base(saldo, modo)
 
-        machines_state[machine_id].update({
-            'status': 'online',
-            'last_update': datetime.now(),
-            'saldo': saldo,
-            'deposito_inicial': deposito_inicial,
-            'aposta_base': aposta_base,
-            'nivel': data.get('nivel', 10),
-            'modo': modo,
-            'sessoes_win': data.get('sessoes_win', 0),
-            'sessoes_loss': data.get('sessoes_loss', 0),
-            'total_rodadas': data.get('total_rodadas', 0),
-            'uptime_start': data.get('uptime_start'),
-            'historico_saldo': data.get('historico_saldo', []),
-            'ultimos_gatilhos': data.get('ultimos_gatilhos', []),
-            'last_mult': data.get('last_mult'),
-            'last_mult_time': data.get('last_mult_time'),
-        })
+        # Lista completa vai para o arquivo comprimido; o estado guarda só o final
+        ultimos_gatilhos = data.get('ultimos_gatilhos', [])
+
+        state = machines_state[machine_id]
+        for field, default in UPDATE_FIELDS:
+            state[field] = data.get(field, default)
+        state['status'] = 'online'
+        state['last_update'] = datetime.now().isoformat()
+        state['saldo'] = saldo
+        state['deposito_inicial'] = deposito_inicial
+        state['aposta_base'] = aposta_base
+        state['modo'] = modo
+        state['ultimos_gatilhos'] = ultimos_gatilhos[-GATILHOS_STATUS_MAX:]
+        historico_saldo = data.get('historico_saldo', [])
+        with _historico_lock:
+            _mesclar_historico_saldo(machine_id, historico_saldo)
+        _arquivar_historico(machine_id, historico_saldo, ultimos_gatilhos)
+
+        update_historical_data(machine_id, state)
+
+        return jsonify_fast({'status': 'ok'})
+    except Exception as e:
+        return jsonify_fast({'error': str(e)}, status=500)
 
-        update_historical_data(machine_id, machines_state[machine_id])
 
-        return jsonify({'status': 'ok'})
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+@app.route('/api/history/<machine_id>')
+def api_history(machine_id):
+    """Séries completas de uma máquina (descomprimidas sob demanda)"""
+    if machine_id not in machines_state:
+        return jsonify_fast({'error': 'Máquina não encontrada'}, status=404)
+
+    arquivo = _historico_arquivo[machine_id]
+    if arquivo is None:
+        return jsonify_fast({'historico_saldo': [], 'ultimos_gatilhos': []})
+    return app.response_class(zlib.decompress(arquivo), mimetype='application/json')
 
 
 def run_dashboard():
     """Inicia o servidor"""
     load_history()
+    iniciar_poll_local()
     print(f"\n{'='*50}")
     print(f"  DASHBOARD V2 - MartingaleV2")
     print(f"{'='*50}")
     print(f"  http://localhost:{DASHBOARD_PORT}")
     print(f"{'='*50}\n")
-    app.run(host='0.0.0.0', port=DASHBOARD_PORT, debug=False, threaded=True)
+    if WAITRESS_AVAILABLE:
+        serve(app, host='0.0.0.0', port=DASHBOARD_PORT, threads=DASHBOARD_THREADS)
+    else:
+        print("[DASHBOARD] waitress não instalado - usando servidor do Flask")
+        app.run(host='0.0.0.0', port=DASHBOARD_PORT, debug=False, threaded=True)
 
 
 if __name__ == '__main__':
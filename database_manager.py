@@ -7,10 +7,14 @@ Gerencia 3 bases separadas: Rodadas, Apostas e Debug
 """
 
 import json
+import atexit
 import sqlite3
 import time
 import threading
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import groupby
+from datetime import datetime
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 from colorama import Fore, init
@@ -25,8 +29,185 @@ except ImportError:
 
 init(autoreset=True)
 
+# DDL de cada base (idempotente via IF NOT EXISTS), executado com executescript
+RDB_DDL = """
+    CREATE TABLE IF NOT EXISTS rounds (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        multiplier REAL NOT NULL,
+        session_id TEXT,
+        regime TEXT,
+        score REAL,
+        capture_quality TEXT DEFAULT 'OK',
+        ts_unix INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+
+    -- Índices para performance
+    CREATE INDEX IF NOT EXISTS idx_timestamp ON rounds(timestamp);
+    CREATE INDEX IF NOT EXISTS idx_rounds_ts_unix ON rounds(ts_unix);
+    CREATE INDEX IF NOT EXISTS idx_multiplier ON rounds(multiplier);
+    CREATE INDEX IF NOT EXISTS idx_session ON rounds(session_id);
+    -- get_recent_rounds: filtro por sessão já ordenado por timestamp
+    CREATE INDEX IF NOT EXISTS idx_rounds_session_ts ON rounds(session_id, timestamp DESC);
+"""
+
+BDB_DDL = """
+    -- Tabela de recomendações
+    CREATE TABLE IF NOT EXISTS recommendations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        session_id TEXT,
+        pattern_detected TEXT,
+        sequence_multipliers TEXT,
+        regime TEXT,
+        score REAL,
+        should_bet BOOLEAN,
+        recommended_amount REAL,
+        recommended_target REAL,
+        confidence_level TEXT,
+        reason TEXT,
+        filters_passed TEXT,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+
+    -- Tabela de apostas executadas
+    CREATE TABLE IF NOT EXISTS bets_executed (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        session_id TEXT,
+        recommendation_id INTEGER,
+        bet_amount REAL,
+        target_multiplier REAL,
+        actual_multiplier REAL,
+        result TEXT,
+        profit_loss REAL,
+        execution_time REAL,
+        bet_slot INTEGER DEFAULT 1,
+        profile_used TEXT,
+        working_balance_before REAL,
+        working_balance_after REAL,
+        tentativa INTEGER DEFAULT 1,
+        ts_unix INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (recommendation_id) REFERENCES recommendations (id)
+    );
+
+    -- Índices
+    CREATE INDEX IF NOT EXISTS idx_bets_timestamp ON bets_executed(timestamp);
+    CREATE INDEX IF NOT EXISTS idx_recommendations_timestamp ON recommendations(timestamp);
+    CREATE INDEX IF NOT EXISTS idx_bets_result ON bets_executed(result);
+    -- Índice de cobertura para get_bet_statistics (consulta só lê o índice)
+    CREATE INDEX IF NOT EXISTS idx_bets_stats ON bets_executed(
+        session_id, ts_unix, result, profit_loss, bet_amount, target_multiplier
+    );
+"""
+
+DDB_DDL = """
+    -- Logs de sistema
+    CREATE TABLE IF NOT EXISTS system_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        session_id TEXT,
+        level TEXT,
+        module TEXT,
+        message TEXT,
+        details TEXT,
+        ts_unix INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+
+    -- Erros de captura
+    CREATE TABLE IF NOT EXISTS capture_errors (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        session_id TEXT,
+        error_type TEXT,
+        area_name TEXT,
+        coordinates TEXT,
+        error_message TEXT,
+        screenshot_path TEXT,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+
+    -- Eventos de refresh
+    CREATE TABLE IF NOT EXISTS refresh_events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        session_id TEXT,
+        reason TEXT,
+        time_since_last_explosion REAL,
+        manual BOOLEAN DEFAULT FALSE,
+        success BOOLEAN DEFAULT TRUE,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+
+    -- Índices
+    CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON system_logs(timestamp);
+    CREATE INDEX IF NOT EXISTS idx_logs_ts_unix ON system_logs(ts_unix);
+    CREATE INDEX IF NOT EXISTS idx_logs_level ON system_logs(level);
+"""
+
 class DatabaseManager:
     """Gerenciador de banco de dados com 3 bases separadas"""
+
+    # Escrita em lote de rodadas e logs (um commit por lote)
+    FLUSH_INTERVAL = 1.0  # segundos
+    FLUSH_MAX_ROWS = 500
+
+    # Aplicados uma vez por conexão (conexões persistentes por thread)
+    CONNECTION_PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA mmap_size=268435456",
+        "PRAGMA cache_size=-65536",
+    )
+    # Linhas amostradas por índice no ANALYZE (mantém o custo baixo em bancos grandes)
+    ANALYSIS_LIMIT = 1000
+
+    # SQL das escritas frequentes: mesmo texto sempre = hit no cache de
+    # statements preparados da conexão (sem novo sqlite3_prepare)
+    SQL_INSERT_ROUND = """
+        INSERT INTO rounds (multiplier, session_id, regime, score, capture_quality, ts_unix)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """
+    SQL_INSERT_RECOMMENDATION = """
+        INSERT INTO recommendations (
+            session_id, pattern_detected, sequence_multipliers, regime, score,
+            should_bet, recommended_amount, recommended_target, confidence_level,
+            reason, filters_passed
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    SQL_INSERT_BET = """
+        INSERT INTO bets_executed (
+            session_id, recommendation_id, bet_amount, target_multiplier,
+            actual_multiplier, result, profit_loss, execution_time,
+            bet_slot, profile_used, working_balance_before, working_balance_after,
+            tentativa, ts_unix
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    SQL_UPDATE_BET_RESULT = """
+        UPDATE bets_executed 
+        SET actual_multiplier = ?, result = ?, profit_loss = ?, 
+            working_balance_after = ?
+        WHERE id = ?
+    """
+    SQL_INSERT_SYSTEM_LOG = """
+        INSERT INTO system_logs (session_id, level, module, message, details, ts_unix)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """
+    SQL_INSERT_CAPTURE_ERROR = """
+        INSERT INTO capture_errors (
+            session_id, error_type, area_name, coordinates, 
+            error_message, screenshot_path
+        ) VALUES (?, ?, ?, ?, ?, ?)
+    """
+    SQL_INSERT_REFRESH_EVENT = """
+        INSERT INTO refresh_events (
+            session_id, reason, time_since_last_explosion, manual, success
+        ) VALUES (?, ?, ?, ?, ?)
+    """
     
     def __init__(self, db_folder: str = "database"):
         self.db_folder = Path(db_folder)
@@ -36,174 +217,277 @@ class DatabaseManager:
         self.rounds_db = self.db_folder / "rounds.db"
         self.bets_db = self.db_folder / "bets.db" 
         self.debug_db = self.db_folder / "debug.db"
+        self._table_db = {
+            'rounds': self.rounds_db,
+            'recommendations': self.bets_db,
+            'bets_executed': self.bets_db,
+            'system_logs': self.debug_db,
+            'capture_errors': self.debug_db,
+            'refresh_events': self.debug_db,
+        }
         
-        # Lock para thread safety
-        self.lock = threading.Lock()
+        # Um lock de escrita por banco (arquivos distintos não disputam lock;
+        # leituras não travam: no WAL leitor e escritor não se bloqueiam)
+        self._lock_rounds = threading.RLock()
+        self._lock_bets = threading.RLock()
+        self._lock_debug = threading.RLock()
+        self._db_locks = {
+            self.rounds_db: self._lock_rounds,
+            self.bets_db: self._lock_bets,
+            self.debug_db: self._lock_debug,
+        }
+
+        # Conexões persistentes: uma por banco por thread, todas registradas
+        # para close() fechar também as criadas por outras threads
+        self._local = threading.local()
+        self._conns_lock = threading.Lock()
+        self._todas_conns: List[sqlite3.Connection] = []
+
+        # Pool para consultas de status em paralelo (uma thread por banco)
+        self._status_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="db-status")
+
+        # Buffer de INSERTs pendentes por banco: [(sql, params), ...]
+        self._buffer_lock = threading.Lock()
+        self._write_buffer = {self.rounds_db: [], self.debug_db: []}
         
         # Inicializar bancos
         self.init_databases()
+
+        # Thread que descarrega o buffer a cada FLUSH_INTERVAL ou FLUSH_MAX_ROWS
+        self._flush_event = threading.Event()
+        self._parar_flush = threading.Event()
+        self._flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flush_thread.start()
+        atexit.register(self.close)
         
         print(f"{Fore.GREEN}💾 Database Manager inicializado")
         print(f"{Fore.CYAN}📁 Pasta: {self.db_folder}")
     
+    def _get_conn(self, db_path: Path) -> sqlite3.Connection:
+        """Retorna a conexão desta thread para o banco (cria na primeira vez)"""
+        conns = getattr(self._local, 'conns', None)
+        if conns is None:
+            conns = self._local.conns = {}
+
+        conn = conns.get(db_path)
+        if conn is None:
+            # check_same_thread=False só para close() poder fechá-la de outra
+            # thread; no uso normal cada conexão fica na thread que a criou
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            for pragma in self.CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            conns[db_path] = conn
+            with self._conns_lock:
+                self._todas_conns.append(conn)
+        return conn
+
+    def _analisar(self, conn: sqlite3.Connection):
+        """Atualiza sqlite_stat1 para o planner escolher os índices certos"""
+        conn.execute(f"PRAGMA analysis_limit={self.ANALYSIS_LIMIT}")
+        conn.execute("ANALYZE")
+
+    def close(self):
+        """Para a thread de flush, grava o buffer e fecha todas as conexões
+
+        Roda PRAGMA optimize em cada conexão antes de fechar. Chamadas
+        repetidas (ex.: manual + atexit) não fazem nada.
+        """
+        if self._parar_flush.is_set():
+            return
+        self._parar_flush.set()
+        self._flush_event.set()
+        if self._flush_thread is not threading.current_thread():
+            self._flush_thread.join()
+        self._status_executor.shutdown(wait=True)
+
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"{Fore.RED}❌ Erro ao gravar lote final no banco: {e}")
+
+        with self._conns_lock:
+            conns, self._todas_conns = self._todas_conns, []
+        for conn in conns:
+            try:
+                conn.execute("PRAGMA optimize")
+                conn.close()
+            except sqlite3.Error as e:
+                print(f"{Fore.YELLOW}⚠️ Erro ao fechar conexão: {e}")
+        local_conns = getattr(self._local, 'conns', None)
+        if local_conns:
+            local_conns.clear()
+
     def init_databases(self):
         """Inicializa as 3 bases de dados"""
         self.init_rounds_db()
         self.init_bets_db()
         self.init_debug_db()
     
+    def _migrar_ts_unix(self, conn: sqlite3.Connection, table: str):
+        """Migração: coluna ts_unix (epoch em segundos) preenchida a partir de timestamp"""
+        try:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN ts_unix INTEGER")
+        except sqlite3.OperationalError:
+            return  # Coluna já existe (ou tabela ainda não criada)
+        conn.execute(f"UPDATE {table} SET ts_unix = CAST(strftime('%s', timestamp) AS INTEGER)")
+
     def init_rounds_db(self):
         """Base 1: Rodadas com timestamps"""
-        with sqlite3.connect(self.rounds_db) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS rounds (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    multiplier REAL NOT NULL,
-                    session_id TEXT,
-                    regime TEXT,
-                    score REAL,
-                    capture_quality TEXT DEFAULT 'OK',
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Índices para performance
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_timestamp ON rounds(timestamp)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_multiplier ON rounds(multiplier)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_session ON rounds(session_id)")
-            
-            conn.commit()
+        conn = self._get_conn(self.rounds_db)
+        with conn:
+            self._migrar_ts_unix(conn, 'rounds')
+        conn.executescript(RDB_DDL)
+        self._analisar(conn)
     
     def init_bets_db(self):
         """Base 2: Recomendações e apostas"""
-        with sqlite3.connect(self.bets_db) as conn:
-            # Tabela de recomendações
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS recommendations (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    session_id TEXT,
-                    pattern_detected TEXT,
-                    sequence_multipliers TEXT,
-                    regime TEXT,
-                    score REAL,
-                    should_bet BOOLEAN,
-                    recommended_amount REAL,
-                    recommended_target REAL,
-                    confidence_level TEXT,
-                    reason TEXT,
-                    filters_passed TEXT,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Tabela de apostas executadas
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS bets_executed (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    session_id TEXT,
-                    recommendation_id INTEGER,
-                    bet_amount REAL,
-                    target_multiplier REAL,
-                    actual_multiplier REAL,
-                    result TEXT,
-                    profit_loss REAL,
-                    execution_time REAL,
-                    bet_slot INTEGER DEFAULT 1,
-                    profile_used TEXT,
-                    working_balance_before REAL,
-                    working_balance_after REAL,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (recommendation_id) REFERENCES recommendations (id)
-                )
-            """)
-            
-            # Índices
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_bets_timestamp ON bets_executed(timestamp)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_recommendations_timestamp ON recommendations(timestamp)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_bets_result ON bets_executed(result)")
-
+        conn = self._get_conn(self.bets_db)
+        with conn:
+            self._migrar_ts_unix(conn, 'bets_executed')
             # Migração: adicionar coluna tentativa se não existir
             try:
                 conn.execute("ALTER TABLE bets_executed ADD COLUMN tentativa INTEGER DEFAULT 1")
             except:
                 pass  # Coluna já existe
-
-            conn.commit()
+        conn.executescript(BDB_DDL)
+        # Estatísticas para o planner preferir idx_bets_stats
+        self._analisar(conn)
     
     def init_debug_db(self):
         """Base 3: Debug e logs do sistema"""
-        with sqlite3.connect(self.debug_db) as conn:
-            # Logs de sistema
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS system_logs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    session_id TEXT,
-                    level TEXT,
-                    module TEXT,
-                    message TEXT,
-                    details TEXT,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Erros de captura
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS capture_errors (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    session_id TEXT,
-                    error_type TEXT,
-                    area_name TEXT,
-                    coordinates TEXT,
-                    error_message TEXT,
-                    screenshot_path TEXT,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Eventos de refresh
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS refresh_events (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    session_id TEXT,
-                    reason TEXT,
-                    time_since_last_explosion REAL,
-                    manual BOOLEAN DEFAULT FALSE,
-                    success BOOLEAN DEFAULT TRUE,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Índices
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON system_logs(timestamp)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_logs_level ON system_logs(level)")
-            
-            conn.commit()
+        conn = self._get_conn(self.debug_db)
+        with conn:
+            self._migrar_ts_unix(conn, 'system_logs')
+        conn.executescript(DDB_DDL)
+        self._analisar(conn)
     
+    # ===== ESCRITA EM LOTE =====
+
+    def _enqueue(self, db_path: Path, sql: str, params: tuple):
+        """Enfileira um INSERT; acorda a thread de flush se o lote encheu"""
+        with self._buffer_lock:
+            buffer = self._write_buffer[db_path]
+            buffer.append((sql, params))
+            cheio = len(buffer) >= self.FLUSH_MAX_ROWS
+        if cheio:
+            self._flush_event.set()
+
+    def _flush_loop(self):
+        """Loop da thread de flush (termina quando close() é chamado)"""
+        while not self._parar_flush.is_set():
+            self._flush_event.wait(self.FLUSH_INTERVAL)
+            self._flush_event.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"{Fore.RED}❌ Erro ao gravar lote no banco (mantido no buffer, nova tentativa no próximo ciclo): {e}")
+
+    def flush(self):
+        """Grava todos os INSERTs pendentes (uma transação por banco)
+
+        Se a gravação de um banco falhar, o lote volta para o início do buffer
+        (nada se perde) e o erro é relançado após tentar os demais bancos.
+        """
+        erro = None
+        for db_path in self._write_buffer:
+            # Retira o lote já com o lock do banco: preserva a ordem de gravação
+            with self._db_locks[db_path]:
+                with self._buffer_lock:
+                    rows = self._write_buffer[db_path]
+                    if not rows:
+                        continue
+                    self._write_buffer[db_path] = []
+
+                try:
+                    with self._get_conn(db_path) as conn:
+                        for sql, grupo in groupby(rows, key=lambda r: r[0]):
+                            conn.executemany(sql, [params for _, params in grupo])
+                        conn.commit()
+                except Exception as e:
+                    # Rollback feito pelo "with conn": devolver o lote na frente do buffer
+                    with self._buffer_lock:
+                        self._write_buffer[db_path] = rows + self._write_buffer[db_path]
+                    erro = erro or e
+        if erro is not None:
+            raise erro
+
     # ===== MÉTODOS PARA RODADAS =====
     
     def save_round(self, multiplier: float, session_id: str, regime: str = None, 
-                   score: float = None, capture_quality: str = "OK") -> int:
-        """Salva uma rodada no banco"""
-        with self.lock:
-            with sqlite3.connect(self.rounds_db) as conn:
-                cursor = conn.execute("""
-                    INSERT INTO rounds (multiplier, session_id, regime, score, capture_quality)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (multiplier, session_id, regime, score, capture_quality))
-                
-                round_id = cursor.lastrowid
-                conn.commit()
-                return round_id
+                   score: float = None, capture_quality: str = "OK",
+                   sincrono: bool = False) -> Optional[int]:
+        """Salva uma rodada no banco
+
+        Padrão: gravação em lote, retorna None (o ID é atribuído pelo SQLite no flush).
+        sincrono=True: grava agora (após o buffer pendente) e retorna o ID.
+        """
+        params = (multiplier, session_id, regime, score, capture_quality, int(time.time()))
+        if not sincrono:
+            self._enqueue(self.rounds_db, self.SQL_INSERT_ROUND, params)
+            return None
+
+        self.flush()
+        with self._lock_rounds:
+            with self._get_conn(self.rounds_db) as conn:
+                return conn.execute(self.SQL_INSERT_ROUND, params).lastrowid
     
+    def save_rounds_batch(self, rows: List[tuple]) -> List[int]:
+        """Salva várias rodadas numa única transação (síncrono)
+
+        rows: tuplas (multiplier, session_id, regime, score, capture_quality)
+        """
+        if not rows:
+            return []
+        ts_unix = int(time.time())
+
+        self.flush()
+        with self._lock_rounds:
+            with self._get_conn(self.rounds_db) as conn:
+                conn.executemany(self.SQL_INSERT_ROUND, [(*row, ts_unix) for row in rows])
+                # A transação segura o lock de escrita do arquivo: nenhum outro
+                # processo insere no meio, então os IDs do lote são consecutivos
+                last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        return list(range(last_id - len(rows) + 1, last_id + 1))
+
+    def bulk_import_rounds(self, rows: List[tuple]) -> List[int]:
+        """Importação histórica de rodadas sem manter índices a cada linha"""
+        with self.bulk_load('rounds'):
+            return self.save_rounds_batch(rows)
+
+    @contextmanager
+    def bulk_load(self, table: str):
+        """Carga em massa: remove os índices da tabela e recria ao sair
+
+        Recriar o índice uma vez é bem mais barato que atualizá-lo por linha.
+        Nesta thread, synchronous=OFF durante a carga (o WAL é mantido, pois
+        a thread de flush tem sua própria conexão aberta).
+        """
+        self.flush()
+        db_path = self._table_db[table]
+        conn = self._get_conn(db_path)
+        with self._db_locks[db_path]:
+            indexes = conn.execute(
+                "SELECT name, sql FROM sqlite_master "
+                "WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+                (table,)
+            ).fetchall()
+            with conn:
+                for name, _ in indexes:
+                    conn.execute(f"DROP INDEX IF EXISTS {name}")
+            conn.execute("PRAGMA synchronous=OFF")
+        try:
+            yield conn
+        finally:
+            with self._db_locks[db_path]:
+                with conn:
+                    for _, sql in indexes:
+                        conn.execute(sql)
+                conn.execute("PRAGMA synchronous=NORMAL")
+
     def get_recent_rounds(self, session_id: str, limit: int = 100) -> List[Dict]:
         """Recupera rodadas recentes"""
-        with sqlite3.connect(self.rounds_db) as conn:
+        self.flush()
+        with self._get_conn(self.rounds_db) as conn:
             cursor = conn.execute("""
                 SELECT id, timestamp, multiplier, regime, score, capture_quality
                 FROM rounds 
@@ -215,16 +499,44 @@ class DatabaseManager:
             columns = [desc[0] for desc in cursor.description]
             return [dict(zip(columns, row)) for row in cursor.fetchall()]
     
+    def get_round_stats(self, session_id: str, limit: int = 1000) -> Optional[Dict]:
+        """Estatísticas das últimas N rodadas da sessão, agregadas no SQLite"""
+        self.flush()
+        with self._get_conn(self.rounds_db) as conn:
+            cursor = conn.execute("""
+                SELECT COUNT(*), AVG(multiplier), MAX(multiplier), MIN(multiplier),
+                       SUM(multiplier < 2.0)
+                FROM (
+                    SELECT multiplier FROM rounds
+                    WHERE session_id = ?
+                    ORDER BY timestamp DESC
+                    LIMIT ?
+                )
+            """, (session_id, limit))
+
+            total, avg_mult, max_mult, min_mult, baixos = cursor.fetchone()
+            if not total:
+                return None
+
+            return {
+                'total': total,
+                'avg_multiplier': avg_mult,
+                'max_multiplier': max_mult,
+                'min_multiplier': min_mult,
+                'baixos_count': baixos
+            }
+    
     def get_rounds_by_timeframe(self, hours: int = 24) -> List[Dict]:
         """Recupera rodadas por período"""
-        since = datetime.now() - timedelta(hours=hours)
+        since = int(time.time()) - hours * 3600
         
-        with sqlite3.connect(self.rounds_db) as conn:
+        self.flush()
+        with self._get_conn(self.rounds_db) as conn:
             cursor = conn.execute("""
                 SELECT id, timestamp, multiplier, session_id, regime, score
                 FROM rounds 
-                WHERE timestamp >= ?
-                ORDER BY timestamp DESC
+                WHERE ts_unix >= ?
+                ORDER BY ts_unix DESC
             """, (since,))
             
             columns = [desc[0] for desc in cursor.description]
@@ -238,15 +550,9 @@ class DatabaseManager:
                           recommended_target: float = None, confidence_level: str = None,
                           reason: str = None, filters_passed: List[str] = None) -> int:
         """Salva recomendação de aposta"""
-        with self.lock:
-            with sqlite3.connect(self.bets_db) as conn:
-                cursor = conn.execute("""
-                    INSERT INTO recommendations (
-                        session_id, pattern_detected, sequence_multipliers, regime, score,
-                        should_bet, recommended_amount, recommended_target, confidence_level,
-                        reason, filters_passed
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
+        with self._lock_bets:
+            with self._get_conn(self.bets_db) as conn:
+                cursor = conn.execute(self.SQL_INSERT_RECOMMENDATION, (
                     session_id, pattern_detected, json.dumps(sequence_multipliers), regime, score,
                     should_bet, recommended_amount, recommended_target, confidence_level,
                     reason, json.dumps(filters_passed) if filters_passed else None
@@ -265,20 +571,13 @@ class DatabaseManager:
                           working_balance_after: float = None,
                           tentativa: int = 1) -> int:
         """Salva execução de aposta"""
-        with self.lock:
-            with sqlite3.connect(self.bets_db) as conn:
-                cursor = conn.execute("""
-                    INSERT INTO bets_executed (
-                        session_id, recommendation_id, bet_amount, target_multiplier,
-                        actual_multiplier, result, profit_loss, execution_time,
-                        bet_slot, profile_used, working_balance_before, working_balance_after,
-                        tentativa
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
+        with self._lock_bets:
+            with self._get_conn(self.bets_db) as conn:
+                cursor = conn.execute(self.SQL_INSERT_BET, (
                     session_id, recommendation_id, bet_amount, target_multiplier,
                     actual_multiplier, result, profit_loss, execution_time,
                     bet_slot, profile_used, working_balance_before, working_balance_after,
-                    tentativa
+                    tentativa, int(time.time())
                 ))
 
                 bet_id = cursor.lastrowid
@@ -288,28 +587,33 @@ class DatabaseManager:
     def update_bet_result(self, bet_id: int, actual_multiplier: float, 
                          result: str, profit_loss: float, working_balance_after: float):
         """Atualiza resultado da aposta"""
-        with self.lock:
-            with sqlite3.connect(self.bets_db) as conn:
-                conn.execute("""
-                    UPDATE bets_executed 
-                    SET actual_multiplier = ?, result = ?, profit_loss = ?, 
-                        working_balance_after = ?
-                    WHERE id = ?
-                """, (actual_multiplier, result, profit_loss, working_balance_after, bet_id))
+        self.update_bet_results([(bet_id, actual_multiplier, result, profit_loss, working_balance_after)])
+
+    def update_bet_results(self, rows: List[tuple]):
+        """Atualiza resultado de várias apostas numa única transação
+
+        rows: tuplas (bet_id, actual_multiplier, result, profit_loss, working_balance_after)
+        """
+        with self._lock_bets:
+            with self._get_conn(self.bets_db) as conn:
+                conn.executemany(self.SQL_UPDATE_BET_RESULT, [
+                    (actual_multiplier, result, profit_loss, working_balance_after, bet_id)
+                    for bet_id, actual_multiplier, result, profit_loss, working_balance_after in rows
+                ])
                 conn.commit()
     
     def get_bet_statistics(self, session_id: str = None, days: int = 7) -> Dict:
         """Calcula estatísticas de apostas"""
-        since = datetime.now() - timedelta(days=days)
+        since = int(time.time()) - days * 86400
         
-        where_clause = "WHERE timestamp >= ?"
+        where_clause = "WHERE ts_unix >= ?"
         params = [since]
         
         if session_id:
             where_clause += " AND session_id = ?"
             params.append(session_id)
         
-        with sqlite3.connect(self.bets_db) as conn:
+        with self._get_conn(self.bets_db) as conn:
             # Total de apostas
             cursor = conn.execute(f"""
                 SELECT COUNT(*), 
@@ -342,62 +646,69 @@ class DatabaseManager:
     def log_system(self, session_id: str, level: str, module: str, 
                    message: str, details: str = None):
         """Log de sistema"""
-        with self.lock:
-            with sqlite3.connect(self.debug_db) as conn:
-                conn.execute("""
-                    INSERT INTO system_logs (session_id, level, module, message, details)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (session_id, level, module, message, details))
-                conn.commit()
+        self._enqueue(self.debug_db, self.SQL_INSERT_SYSTEM_LOG, (session_id, level, module, message, details, int(time.time())))
     
     def log_capture_error(self, session_id: str, error_type: str, area_name: str,
                          coordinates: str, error_message: str, screenshot_path: str = None):
         """Log de erro de captura"""
-        with self.lock:
-            with sqlite3.connect(self.debug_db) as conn:
-                conn.execute("""
-                    INSERT INTO capture_errors (
-                        session_id, error_type, area_name, coordinates, 
-                        error_message, screenshot_path
-                    ) VALUES (?, ?, ?, ?, ?, ?)
-                """, (session_id, error_type, area_name, coordinates, error_message, screenshot_path))
-                conn.commit()
+        self._enqueue(self.debug_db, self.SQL_INSERT_CAPTURE_ERROR, (session_id, error_type, area_name, coordinates, error_message, screenshot_path))
     
     def log_refresh_event(self, session_id: str, reason: str, 
                          time_since_last_explosion: float, manual: bool = False, 
                          success: bool = True):
         """Log de evento de refresh"""
-        with self.lock:
-            with sqlite3.connect(self.debug_db) as conn:
-                conn.execute("""
-                    INSERT INTO refresh_events (
-                        session_id, reason, time_since_last_explosion, manual, success
-                    ) VALUES (?, ?, ?, ?, ?)
-                """, (session_id, reason, time_since_last_explosion, manual, success))
-                conn.commit()
+        self._enqueue(self.debug_db, self.SQL_INSERT_REFRESH_EVENT, (session_id, reason, time_since_last_explosion, manual, success))
     
     # ===== MÉTODOS DE LIMPEZA =====
     
     def cleanup_old_data(self, days_to_keep: int = 30):
         """Remove dados antigos"""
-        cutoff = datetime.now() - timedelta(days=days_to_keep)
+        cutoff = int(time.time()) - days_to_keep * 86400
         
-        with self.lock:
-            # Limpeza das rodadas
-            with sqlite3.connect(self.rounds_db) as conn:
-                cursor = conn.execute("DELETE FROM rounds WHERE timestamp < ?", (cutoff,))
-                rounds_deleted = cursor.rowcount
-                conn.commit()
-            
-            # Limpeza dos logs de debug
-            with sqlite3.connect(self.debug_db) as conn:
-                cursor = conn.execute("DELETE FROM system_logs WHERE timestamp < ?", (cutoff,))
-                logs_deleted = cursor.rowcount
-                conn.commit()
-            
-            print(f"{Fore.YELLOW}🧹 Limpeza executada:")
-            print(f"{Fore.WHITE}   Rodadas removidas: {rounds_deleted}")
-            print(f"{Fore.WHITE}   Logs removidos: {logs_deleted}")
+        self.flush()
+
+        # Limpeza das rodadas
+        rounds_deleted = self._chunked_delete(self.rounds_db, 'rounds', cutoff)
+
+        # Limpeza dos logs de debug
+        logs_deleted = self._chunked_delete(self.debug_db, 'system_logs', cutoff)
+
+        print(f"{Fore.YELLOW}🧹 Limpeza executada:")
+        print(f"{Fore.WHITE}   Rodadas removidas: {rounds_deleted}")
+        print(f"{Fore.WHITE}   Logs removidos: {logs_deleted}")
+
+    def _chunked_delete(self, db_path: Path, table: str, cutoff: int, chunk: int = 5000) -> int:
+        """Apaga linhas com ts_unix < cutoff em transações de até `chunk` linhas
+
+        Libera o lock entre os lotes para não travar as escritas da sessão.
+        Ao final faz checkpoint do WAL, VACUUM se mais de 10% da tabela saiu
+        e ANALYZE.
+        """
+        conn = self._get_conn(db_path)
+        total_before = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+        lock = self._db_locks[db_path]
+        deleted = 0
+        while True:
+            with lock:
+                with conn:
+                    cursor = conn.execute(f"""
+                        DELETE FROM {table} WHERE id IN (
+                            SELECT id FROM {table} WHERE ts_unix < ? LIMIT ?
+                        )
+                    """, (cutoff, chunk))
+            if cursor.rowcount <= 0:
+                break
+            deleted += cursor.rowcount
+
+        if deleted:
+            with lock:
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                if deleted > total_before * 0.1:
+                    conn.execute("VACUUM")
+                # Distribuição mudou: refazer estatísticas
+                self._analisar(conn)
+        return deleted
     
     # ===== MÉTODOS DE RELATÓRIO =====
     
@@ -409,16 +720,9 @@ class DatabaseManager:
         }
         
         # Dados de rodadas
-        rounds = self.get_recent_rounds(session_id, 1000)
-        if rounds:
-            multipliers = [r['multiplier'] for r in rounds]
-            report['rounds'] = {
-                'total': len(rounds),
-                'avg_multiplier': sum(multipliers) / len(multipliers),
-                'max_multiplier': max(multipliers),
-                'min_multiplier': min(multipliers),
-                'baixos_count': len([m for m in multipliers if m < 2.0])
-            }
+        round_stats = self.get_round_stats(session_id, 1000)
+        if round_stats:
+            report['rounds'] = round_stats
         
         # Estatísticas de apostas
         bet_stats = self.get_bet_statistics(session_id)
@@ -428,27 +732,24 @@ class DatabaseManager:
     
     def get_database_status(self) -> Dict:
         """Status dos bancos de dados"""
-        status = {}
-        
-        # Status das rodadas
-        with sqlite3.connect(self.rounds_db) as conn:
-            cursor = conn.execute("SELECT COUNT(*) FROM rounds")
-            status['rounds_total'] = cursor.fetchone()[0]
-        
-        # Status das apostas
-        with sqlite3.connect(self.bets_db) as conn:
-            cursor = conn.execute("SELECT COUNT(*) FROM recommendations")
-            status['recommendations_total'] = cursor.fetchone()[0]
-            
-            cursor = conn.execute("SELECT COUNT(*) FROM bets_executed")
-            status['bets_total'] = cursor.fetchone()[0]
-        
-        # Status dos logs
-        with sqlite3.connect(self.debug_db) as conn:
-            cursor = conn.execute("SELECT COUNT(*) FROM system_logs")
-            status['logs_total'] = cursor.fetchone()[0]
-        
-        return status
+        self.flush()
+
+        def contar(db_path, tables):
+            conn = self._get_conn(db_path)
+            return [conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in tables]
+
+        # Uma consulta por banco, em paralelo (leitores não se bloqueiam no WAL)
+        rounds = self._status_executor.submit(contar, self.rounds_db, ('rounds',))
+        bets = self._status_executor.submit(contar, self.bets_db, ('recommendations', 'bets_executed'))
+        logs = self._status_executor.submit(contar, self.debug_db, ('system_logs',))
+
+        recommendations_total, bets_total = bets.result()
+        return {
+            'rounds_total': rounds.result()[0],
+            'recommendations_total': recommendations_total,
+            'bets_total': bets_total,
+            'logs_total': logs.result()[0],
+        }
 
 def main():
     """Teste do Database Manager"""
@@ -463,7 +764,7 @@ def main():
     # Teste de rodadas
     print(f"\n{Fore.YELLOW}🎯 Testando salvamento de rodadas...")
     for i, mult in enumerate([1.5, 2.3, 1.8, 4.2, 1.1], 1):
-        round_id = db.save_round(mult, session_id, "FAVORAVEL", 75.5)
+        round_id = db.save_round(mult, session_id, "FAVORAVEL", 75.5, sincrono=True)
         print(f"{Fore.GREEN}✅ Rodada {i}: {mult}x (ID: {round_id})")
     
     # Teste de recomendações
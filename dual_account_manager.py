@@ -28,10 +28,20 @@ Comandos Telegram:
 
 import json
 import os
+import sys
+import secrets
+import threading
 from dataclasses import dataclass, field
-from datetime import datetime, date
+from datetime import datetime
 from typing import Dict, List, Optional
 
+# Serialização JSON rápida (fallback: json da stdlib)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 # Caminho base
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -39,6 +49,24 @@ DUAL_ACCOUNT_STATE_FILE = os.path.join(BASE_DIR, 'dual_account_state.json')
 CONSERVADORA_REMOTE_STATE_FILE = os.path.join(BASE_DIR, 'conservadora_remote_state.json')
 
 
+def _dumps_estado(data: Dict) -> bytes:
+    """Serializa estado para bytes JSON indentado (orjson quando disponivel)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode('utf-8')
+
+
+def _loads_estado(buf: bytes) -> Dict:
+    """Desserializa bytes JSON (orjson quando disponivel)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(buf)
+    return json.loads(buf)
+
+
+# __slots__ nas sessoes (menos memoria e acesso a atributo mais rapido; Python 3.10+)
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
 # ============================================================
 # CONFIGURACOES
 # ============================================================
@@ -49,12 +77,22 @@ MEDIA_DIARIA_NS9_PCT = 8.26
 # Stop-win em 70% da media
 STOP_WIN_PCT = MEDIA_DIARIA_NS9_PCT * 0.70  # 5.78%
 
+# Bloco 'config' de get_status: constante, montado uma vez (somente leitura)
+STATUS_CONFIG = {
+    'meta_migracao_pct': STOP_WIN_PCT,
+    'media_ns9': MEDIA_DIARIA_NS9_PCT,
+}
+
+# Tamanho maximo dos historicos mantidos (podados a cada append)
+HISTORICO_DIAS_MAX = 30
+HISTORICO_SAQUES_MAX = 50
+
 
 # ============================================================
 # SESSAO INTRADAY
 # ============================================================
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class SessaoIntraday:
     """Estatisticas do dia atual"""
 
@@ -89,21 +127,18 @@ class SessaoIntraday:
 
     @classmethod
     def from_dict(cls, data: Dict) -> 'SessaoIntraday':
-        s = cls()
-        s.data = data.get('data', '')
-
         ca = data.get('conta_a', {})
-        s.conta_a_inicio = ca.get('inicio', 0)
-        s.conta_a_atual = ca.get('atual', 0)
-        s.conta_a_modo = ca.get('modo', 'NS9')
-        s.conta_a_migrou = ca.get('migrou', False)
-        s.conta_a_hora_migracao = ca.get('hora_migracao', '')
-
         cb = data.get('conta_b', {})
-        s.conta_b_inicio = cb.get('inicio', 0)
-        s.conta_b_atual = cb.get('atual', 0)
-
-        return s
+        return cls(
+            data=data.get('data', ''),
+            conta_a_inicio=ca.get('inicio', 0),
+            conta_a_atual=ca.get('atual', 0),
+            conta_a_modo=ca.get('modo', 'NS9'),
+            conta_a_migrou=ca.get('migrou', False),
+            conta_a_hora_migracao=ca.get('hora_migracao', ''),
+            conta_b_inicio=cb.get('inicio', 0),
+            conta_b_atual=cb.get('atual', 0),
+        )
 
     @property
     def lucro_a(self) -> float:
@@ -138,7 +173,7 @@ class SessaoIntraday:
 # SESSAO PRINCIPAL
 # ============================================================
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class SessaoPrincipal:
     """Acumulado total da estrategia"""
 
@@ -168,24 +203,24 @@ class SessaoPrincipal:
             'total_saques': self.total_saques,
             'total_dias': self.total_dias,
             'total_migracoes': self.total_migracoes,
-            'historico_dias': self.historico_dias[-30:],
-            'historico_saques': self.historico_saques[-50:],
+            'historico_dias': self.historico_dias,
+            'historico_saques': self.historico_saques,
             'banca_pico': self.banca_pico,
         }
 
     @classmethod
     def from_dict(cls, data: Dict) -> 'SessaoPrincipal':
-        s = cls()
-        s.sessao_id = data.get('sessao_id', '')
-        s.inicio_timestamp = data.get('inicio_timestamp', '')
-        s.deposito_inicial = data.get('deposito_inicial', 0)
-        s.total_saques = data.get('total_saques', 0)
-        s.total_dias = data.get('total_dias', 0)
-        s.total_migracoes = data.get('total_migracoes', 0)
-        s.historico_dias = data.get('historico_dias', [])
-        s.historico_saques = data.get('historico_saques', [])
-        s.banca_pico = data.get('banca_pico', 0)
-        return s
+        return cls(
+            sessao_id=data.get('sessao_id', ''),
+            inicio_timestamp=data.get('inicio_timestamp', ''),
+            deposito_inicial=data.get('deposito_inicial', 0),
+            total_saques=data.get('total_saques', 0),
+            total_dias=data.get('total_dias', 0),
+            total_migracoes=data.get('total_migracoes', 0),
+            historico_dias=data.get('historico_dias', [])[-HISTORICO_DIAS_MAX:],
+            historico_saques=data.get('historico_saques', [])[-HISTORICO_SAQUES_MAX:],
+            banca_pico=data.get('banca_pico', 0),
+        )
 
 
 # ============================================================
@@ -193,52 +228,78 @@ class SessaoPrincipal:
 # ============================================================
 
 class DualAccountManager:
-    """Gerenciador das duas contas"""
+    """Gerenciador das duas contas
+
+    Cada alteracao grava na hora (escrita atomica): instancias sao de vida
+    curta (uma por comando do Telegram) e nao deixam nada pendente.
+    """
 
     def __init__(self):
         self.principal: Optional[SessaoPrincipal] = None
         self.intraday: Optional[SessaoIntraday] = None
+        self._save_lock = threading.RLock()
+        self._state_mtime: Optional[float] = None  # mtime do arquivo que lemos/gravamos
         self.carregar()
 
     def carregar(self):
         """Carrega estado salvo"""
         try:
             if os.path.exists(DUAL_ACCOUNT_STATE_FILE):
-                with open(DUAL_ACCOUNT_STATE_FILE, 'r') as f:
-                    data = json.load(f)
+                with open(DUAL_ACCOUNT_STATE_FILE, 'rb') as f:
+                    mtime = os.fstat(f.fileno()).st_mtime
+                    data = _loads_estado(f.read())
                 self.principal = SessaoPrincipal.from_dict(data.get('principal', {}))
                 self.intraday = SessaoIntraday.from_dict(data.get('intraday', {}))
+                self._state_mtime = mtime
         except Exception as e:
             print(f"Erro ao carregar dual account: {e}")
 
-    def salvar(self):
-        """Salva estado atual"""
-        data = {
-            'principal': self.principal.to_dict() if self.principal else {},
-            'intraday': self.intraday.to_dict() if self.intraday else {},
-            'ultima_atualizacao': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        }
-        with open(DUAL_ACCOUNT_STATE_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+    def _maybe_reload(self):
+        """Recarrega so se outro processo/instancia alterou o arquivo"""
+        with self._save_lock:
+            try:
+                mtime = os.stat(DUAL_ACCOUNT_STATE_FILE).st_mtime
+            except OSError:
+                return
+            if mtime != self._state_mtime:
+                self.carregar()
+
+    def salvar(self, agora: Optional[datetime] = None):
+        """Salva estado atual (escrita atomica via rename)
+
+        Args:
+            agora: horario ja obtido pelo metodo chamador (evita outro datetime.now())
+        """
+        with self._save_lock:
+            data = {
+                'principal': self.principal.to_dict() if self.principal else {},
+                'intraday': self.intraday.to_dict() if self.intraday else {},
+                'ultima_atualizacao': (agora or datetime.now()).strftime('%Y-%m-%d %H:%M:%S'),
+            }
+            # Escrita atomica: um crash no meio nao corrompe o estado salvo
+            tmp_file = DUAL_ACCOUNT_STATE_FILE + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                f.write(_dumps_estado(data))
+            os.replace(tmp_file, DUAL_ACCOUNT_STATE_FILE)
+            self._state_mtime = os.stat(DUAL_ACCOUNT_STATE_FILE).st_mtime
 
     def iniciar_sessao(self, saldo_a: float, saldo_b: float) -> str:
         """Inicia nova sessao com saldos das duas contas"""
-        import uuid
-
+        agora = datetime.now()
         self.principal = SessaoPrincipal()
-        self.principal.sessao_id = str(uuid.uuid4())[:8]
-        self.principal.inicio_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.principal.sessao_id = secrets.token_hex(4)
+        self.principal.inicio_timestamp = agora.strftime('%Y-%m-%d %H:%M:%S')
         self.principal.deposito_inicial = saldo_a + saldo_b
         self.principal.banca_pico = saldo_a + saldo_b
 
         self.intraday = SessaoIntraday()
-        self.intraday.data = date.today().isoformat()
+        self.intraday.data = agora.date().isoformat()
         self.intraday.conta_a_inicio = saldo_a
         self.intraday.conta_a_atual = saldo_a
         self.intraday.conta_b_inicio = saldo_b
         self.intraday.conta_b_atual = saldo_b
 
-        self.salvar()
+        self.salvar(agora)
         return self.principal.sessao_id
 
     def atualizar_saldo_a(self, valor: float) -> bool:
@@ -251,11 +312,13 @@ class DualAccountManager:
 
         # Verificar migração automática
         migrou_agora = False
+        agora = None
         if self.intraday.deve_migrar():
-            self.marcar_migracao()
+            agora = datetime.now()
+            self._aplicar_migracao(agora)  # gravada junto com o saldo abaixo
             migrou_agora = True
 
-        self.salvar()
+        self.salvar(agora)
         return migrou_agora
 
     def atualizar_saldo_b(self, valor: float):
@@ -272,28 +335,43 @@ class DualAccountManager:
             if total > self.principal.banca_pico:
                 self.principal.banca_pico = total
 
+    def _aplicar_migracao(self, agora: datetime) -> bool:
+        """Aplica a migracao NS9 -> NS10 em memoria (sem gravar)"""
+        if not self.intraday or self.intraday.conta_a_migrou:
+            return False
+        self.intraday.conta_a_migrou = True
+        self.intraday.conta_a_modo = 'NS10'
+        self.intraday.conta_a_hora_migracao = agora.strftime('%H:%M:%S')
+        if self.principal:
+            self.principal.total_migracoes += 1
+        return True
+
     def marcar_migracao(self):
         """Marca que Conta A migrou de NS9 para NS10"""
-        if self.intraday and not self.intraday.conta_a_migrou:
-            self.intraday.conta_a_migrou = True
-            self.intraday.conta_a_modo = 'NS10'
-            self.intraday.conta_a_hora_migracao = datetime.now().strftime('%H:%M:%S')
-            if self.principal:
-                self.principal.total_migracoes += 1
-            self.salvar()
+        agora = datetime.now()
+        if self._aplicar_migracao(agora):
+            self.salvar(agora)
 
     def verificar_deve_migrar(self) -> tuple:
         """Verifica se deve migrar e retorna (deve_migrar, lucro_pct, meta_pct)"""
+        self._maybe_reload()
         if not self.intraday:
             return False, 0, STOP_WIN_PCT
 
+        lucro_pct = self.intraday.lucro_a_pct
         if self.intraday.conta_a_migrou:
-            return False, self.intraday.lucro_a_pct, STOP_WIN_PCT
+            return False, lucro_pct, STOP_WIN_PCT
+
+        return lucro_pct >= STOP_WIN_PCT, lucro_pct, STOP_WIN_PCT
 
-        return self.intraday.deve_migrar(), self.intraday.lucro_a_pct, STOP_WIN_PCT
+    def calcular_redistribuicao(self, usar_remoto: bool = True,
+                                remoto: Optional[Dict] = None) -> Dict:
+        """Calcula quanto transferir entre contas para igualar 50/50
 
-    def calcular_redistribuicao(self, usar_remoto: bool = True) -> Dict:
-        """Calcula quanto transferir entre contas para igualar 50/50"""
+        Args:
+            remoto: estado remoto da CONSERVADORA ja lido pelo chamador
+        """
+        self._maybe_reload()
         if not self.intraday:
             return {'erro': 'Nenhuma sessao ativa'}
 
@@ -302,7 +380,8 @@ class DualAccountManager:
         conta_b_atual = self.intraday.conta_b_atual
 
         if usar_remoto:
-            remoto = ler_estado_remoto_conservadora()
+            if remoto is None:
+                remoto = ler_estado_remoto_conservadora()
             if remoto and remoto.get('saldo_atual'):
                 conta_b_atual = remoto.get('saldo_atual')
 
@@ -358,12 +437,14 @@ class DualAccountManager:
         if valor > total:
             return False
 
+        agora = datetime.now()
         self.principal.total_saques += valor
         self.principal.historico_saques.append({
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'timestamp': agora.strftime('%Y-%m-%d %H:%M:%S'),
             'valor': valor,
             'conta': conta,
         })
+        del self.principal.historico_saques[:-HISTORICO_SAQUES_MAX]
 
         # Descontar proporcionalmente das duas contas
         if total > 0:
@@ -371,7 +452,7 @@ class DualAccountManager:
             self.intraday.conta_a_atual -= valor * prop_a
             self.intraday.conta_b_atual -= valor * (1 - prop_a)
 
-        self.salvar()
+        self.salvar(agora)
         return True
 
     def reset_dia(self, novo_saldo_a: float, novo_saldo_b: float):
@@ -388,11 +469,13 @@ class DualAccountManager:
                 'lucro_total': self.intraday.lucro_total,
                 'migrou': self.intraday.conta_a_migrou,
             })
+            del self.principal.historico_dias[:-HISTORICO_DIAS_MAX]
             self.principal.total_dias += 1
 
         # Criar novo intraday
+        agora = datetime.now()
         self.intraday = SessaoIntraday()
-        self.intraday.data = date.today().isoformat()
+        self.intraday.data = agora.date().isoformat()
         self.intraday.conta_a_inicio = novo_saldo_a
         self.intraday.conta_a_atual = novo_saldo_a
         self.intraday.conta_a_modo = 'NS9'  # Volta para NS9
@@ -400,70 +483,78 @@ class DualAccountManager:
         self.intraday.conta_b_atual = novo_saldo_b
 
         self._verificar_pico()
-        self.salvar()
+        self.salvar(agora)
 
-    def get_status(self, usar_remoto: bool = True) -> Dict:
+    def get_status(self, usar_remoto: bool = True, remoto: Optional[Dict] = None) -> Dict:
         """Retorna status completo para Telegram
 
         Args:
             usar_remoto: Se True, tenta usar dados remotos da CONSERVADORA (Windows)
+            remoto: estado remoto ja lido pelo chamador (evita nova leitura)
         """
+        self._maybe_reload()
         if not self.principal or not self.intraday:
             return {'ativo': False}
 
+        # Leituras locais: cada property recalcula a cada acesso
+        intraday = self.intraday
+        principal = self.principal
+        lucro_a = intraday.lucro_a
+
         # Verificar dados remotos da CONSERVADORA
-        remoto = None
-        if usar_remoto:
+        if not usar_remoto:
+            remoto = None
+        elif remoto is None:
             remoto = ler_estado_remoto_conservadora()
 
         # Se temos dados remotos, usar para Conta B
         if remoto and remoto.get('saldo_atual'):
-            conta_b_atual = remoto.get('saldo_atual', self.intraday.conta_b_atual)
-            conta_b_inicio = remoto.get('saldo_inicial', self.intraday.conta_b_inicio)
+            conta_b_atual = remoto.get('saldo_atual', intraday.conta_b_atual)
+            conta_b_inicio = remoto.get('saldo_inicial', intraday.conta_b_inicio)
             conta_b_lucro = conta_b_atual - conta_b_inicio
             conta_b_lucro_pct = remoto.get('lucro_percentual', 0)
-            remoto_online = conservadora_remota_online()
+            remoto_online = conservadora_remota_online(remoto)
             remoto_timestamp = remoto.get('ultima_atualizacao', '')
         else:
-            conta_b_atual = self.intraday.conta_b_atual
-            conta_b_inicio = self.intraday.conta_b_inicio
-            conta_b_lucro = self.intraday.lucro_b
-            conta_b_lucro_pct = (self.intraday.lucro_b / self.intraday.conta_b_inicio * 100) if self.intraday.conta_b_inicio > 0 else 0
+            conta_b_atual = intraday.conta_b_atual
+            conta_b_inicio = intraday.conta_b_inicio
+            conta_b_lucro = conta_b_atual - conta_b_inicio
+            conta_b_lucro_pct = (conta_b_lucro / conta_b_inicio * 100) if conta_b_inicio > 0 else 0
             remoto_online = False
             remoto_timestamp = ''
 
-        total_atual = self.intraday.conta_a_atual + conta_b_atual
-        lucro_total = total_atual + self.principal.total_saques - self.principal.deposito_inicial
-        lucro_pct = (lucro_total / self.principal.deposito_inicial * 100) if self.principal.deposito_inicial > 0 else 0
+        total_atual = intraday.conta_a_atual + conta_b_atual
+        lucro_total = total_atual + principal.total_saques - principal.deposito_inicial
+        lucro_pct = (lucro_total / principal.deposito_inicial * 100) if principal.deposito_inicial > 0 else 0
 
         # Atualizar pico se necessário
-        if total_atual > self.principal.banca_pico:
-            self.principal.banca_pico = total_atual
+        if total_atual > principal.banca_pico:
+            principal.banca_pico = total_atual
             self.salvar()
 
         return {
             'ativo': True,
             'principal': {
-                'sessao_id': self.principal.sessao_id,
-                'deposito': self.principal.deposito_inicial,
-                'saques': self.principal.total_saques,
+                'sessao_id': principal.sessao_id,
+                'deposito': principal.deposito_inicial,
+                'saques': principal.total_saques,
                 'banca_atual': total_atual,
                 'lucro': lucro_total,
                 'lucro_pct': lucro_pct,
-                'pico': self.principal.banca_pico,
-                'dias': self.principal.total_dias,
-                'migracoes': self.principal.total_migracoes,
+                'pico': principal.banca_pico,
+                'dias': principal.total_dias,
+                'migracoes': principal.total_migracoes,
             },
             'intraday': {
-                'data': self.intraday.data,
+                'data': intraday.data,
                 'conta_a': {
-                    'modo': self.intraday.conta_a_modo,
-                    'inicio': self.intraday.conta_a_inicio,
-                    'atual': self.intraday.conta_a_atual,
-                    'lucro': self.intraday.lucro_a,
-                    'lucro_pct': self.intraday.lucro_a_pct,
-                    'migrou': self.intraday.conta_a_migrou,
-                    'hora_migracao': self.intraday.conta_a_hora_migracao,
+                    'modo': intraday.conta_a_modo,
+                    'inicio': intraday.conta_a_inicio,
+                    'atual': intraday.conta_a_atual,
+                    'lucro': lucro_a,
+                    'lucro_pct': intraday.lucro_a_pct,
+                    'migrou': intraday.conta_a_migrou,
+                    'hora_migracao': intraday.conta_a_hora_migracao,
                 },
                 'conta_b': {
                     'modo': 'NS10',
@@ -475,12 +566,9 @@ class DualAccountManager:
                     'remoto_online': remoto_online,
                     'remoto_timestamp': remoto_timestamp,
                 },
-                'lucro_total': self.intraday.lucro_a + conta_b_lucro,
-            },
-            'config': {
-                'meta_migracao_pct': STOP_WIN_PCT,
-                'media_ns9': MEDIA_DIARIA_NS9_PCT,
+                'lucro_total': lucro_a + conta_b_lucro,
             },
+            'config': STATUS_CONFIG,
         }
 
 
@@ -492,21 +580,39 @@ def existe_sessao_dual_account() -> bool:
     return os.path.exists(DUAL_ACCOUNT_STATE_FILE)
 
 
+# Ultimo estado remoto lido (so rele o arquivo quando o mtime muda)
+_remote_cache = {'mtime': 0, 'data': None}
+
+
 def ler_estado_remoto_conservadora() -> Optional[Dict]:
     """Le o estado remoto da CONSERVADORA (enviado pelo Windows)"""
     try:
-        if os.path.exists(CONSERVADORA_REMOTE_STATE_FILE):
-            with open(CONSERVADORA_REMOTE_STATE_FILE, 'r') as f:
-                data = json.load(f)
-            return data
+        mtime = os.stat(CONSERVADORA_REMOTE_STATE_FILE).st_mtime
+    except OSError:
+        return None
+
+    if mtime == _remote_cache['mtime']:
+        return _remote_cache['data']
+
+    try:
+        with open(CONSERVADORA_REMOTE_STATE_FILE, 'rb') as f:
+            data = _loads_estado(f.read())
+        _remote_cache['mtime'] = mtime
+        _remote_cache['data'] = data
+        return data
     except Exception as e:
         print(f"Erro ao ler estado remoto: {e}")
     return None
 
 
-def conservadora_remota_online() -> bool:
-    """Verifica se há dados recentes da CONSERVADORA remota (< 5 min)"""
-    data = ler_estado_remoto_conservadora()
+def conservadora_remota_online(data: Optional[Dict] = None) -> bool:
+    """Verifica se há dados recentes da CONSERVADORA remota (< 5 min)
+
+    Args:
+        data: estado remoto ja lido (evita nova leitura)
+    """
+    if data is None:
+        data = ler_estado_remoto_conservadora()
     if not data:
         return False
 
@@ -5,16 +5,36 @@ Quando um gatilho chega em T6 e perde, quais multiplicadores aparecem nas rodada
 Objetivo: encontrar um alvo que SEMPRE aparece em algum momento
 """
 
-from collections import defaultdict
 from typing import List, Dict
-import statistics
+import numpy as np
+
+# Compilação JIT da busca de gatilhos (fallback: versão vetorizada em NumPy)
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 THRESHOLD_BAIXO = 2.0
 GATILHO_SIZE = 6
 ALVO_LUCRO = 1.99
 
+# Multiplicadores tem 2 casas decimais: float32 basta e ocupa metade da memoria.
+# Limiares sao convertidos para o mesmo tipo para as comparacoes baterem.
+MULT_DTYPE = np.float32
+
+
+def carregar_multiplicadores(filepath: str) -> np.ndarray:
+    """Le a primeira coluna do CSV (parser em C do np.loadtxt)
+
+    Se houver linha invalida, cai para a leitura linha a linha que as ignora.
+    """
+    try:
+        return np.loadtxt(filepath, delimiter=',', skiprows=1, usecols=0,
+                          dtype=MULT_DTYPE, encoding='utf-8-sig', ndmin=1)
+    except ValueError:
+        pass
 
-def carregar_multiplicadores(filepath: str) -> List[float]:
     mults = []
     with open(filepath, 'r', encoding='utf-8-sig') as f:
         next(f)
@@ -25,100 +45,138 @@ def carregar_multiplicadores(filepath: str) -> List[float]:
                     mults.append(float(parts[0]))
             except:
                 continue
-    return mults
+    return np.asarray(mults, dtype=MULT_DTYPE)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _find_t6(mults, threshold, gatilho, alvo):
+        """Mesma máquina de estados de encontrar_gatilhos_t6_plus, compilada"""
+        n = len(mults)
+        posicoes = np.empty(n // gatilho + 1, np.int64)
+        total = 0
+        baixos = 0
+        for i in range(n - 20):
+            if mults[i] < threshold:
+                baixos += 1
+                if baixos == gatilho:
+                    pos_t1 = i + 1
+                    chegou_t6 = True
+                    for t in range(5):  # T1 a T5
+                        if mults[pos_t1 + t] >= alvo:
+                            chegou_t6 = False
+                            break
+                    if chegou_t6 and pos_t1 + 5 < n - 15:
+                        posicoes[total] = pos_t1 + 5
+                        total += 1
+                    baixos = 0
+            else:
+                baixos = 0
+        return posicoes[:total]
+
+    @njit(parallel=True, cache=True)
+    def _primeiro_acerto(janelas, alvos):
+        """Tentativa do primeiro acerto por (alvo, gatilho); 0 = nao acertou.
+        Alvos independentes: um por thread."""
+        tentativas = np.zeros((alvos.size, janelas.shape[0]), np.int64)
+        for a in prange(alvos.size):
+            alvo = alvos[a]
+            for i in range(janelas.shape[0]):
+                for t in range(janelas.shape[1]):
+                    if janelas[i, t] >= alvo:
+                        tentativas[a, i] = t + 1
+                        break
+        return tentativas
 
 
-def encontrar_gatilhos_t6_plus(multiplicadores: List[float]) -> List[int]:
+def encontrar_gatilhos_t6_plus(multiplicadores: np.ndarray) -> List[int]:
     """Encontra posicoes onde gatilhos chegaram em T6 ou alem (perderam T5)"""
-    posicoes_t6 = []
-
-    baixos = 0
-    i = 0
-
-    while i < len(multiplicadores) - 20:  # Margem para analisar T7+
-        mult = multiplicadores[i]
-
-        if mult < THRESHOLD_BAIXO:
-            baixos += 1
-
-            if baixos == GATILHO_SIZE:
-                # Gatilho ativado! Verificar se chegou em T6+
-                pos_t1 = i + 1
+    if NUMBA_AVAILABLE:
+        mults = np.asarray(multiplicadores, dtype=MULT_DTYPE)
+        return _find_t6(mults, MULT_DTYPE(THRESHOLD_BAIXO), GATILHO_SIZE, MULT_DTYPE(ALVO_LUCRO)).tolist()
 
-                # Simular ate T5
-                chegou_t6 = True
-                for t in range(1, 6):  # T1 a T5
-                    if pos_t1 + t - 1 < len(multiplicadores):
-                        m = multiplicadores[pos_t1 + t - 1]
-                        if m >= ALVO_LUCRO:
-                            chegou_t6 = False
-                            break
+    mults = np.asarray(multiplicadores, dtype=MULT_DTYPE)
+    n = len(mults)
+    if n <= 20:  # Margem para analisar T7+
+        return []
 
-                if chegou_t6:
-                    # Posicao do T6 (primeiro mult apos T5)
-                    pos_t6 = pos_t1 + 5
-                    if pos_t6 < len(multiplicadores) - 15:
-                        posicoes_t6.append(pos_t6)
+    # Tamanho da sequencia de baixos terminando em cada posicao (sem branches):
+    # distancia ate o ultimo nao-baixo anterior
+    baixo = mults < MULT_DTYPE(THRESHOLD_BAIXO)
+    idx = np.arange(n)
+    ultimo_alto = np.maximum.accumulate(np.where(baixo, -1, idx))
+    sequencia = idx - ultimo_alto
 
-                baixos = 0
-        else:
-            baixos = 0
+    # O contador zera a cada gatilho: dispara a cada GATILHO_SIZE baixos seguidos
+    gatilhos = baixo & (sequencia % GATILHO_SIZE == 0)
+    gatilhos[n - 20:] = False
 
-        i += 1
+    # Perdeu T1 a T5: as 5 rodadas apos o gatilho ficaram abaixo do alvo
+    perdeu_t5 = np.zeros(n, dtype=bool)
+    perdeu_t5[:n - 5] = np.lib.stride_tricks.sliding_window_view(mults[1:], 5).max(axis=1) < MULT_DTYPE(ALVO_LUCRO)
 
-    return posicoes_t6
+    # Posicao do T6 (primeiro mult apos T5)
+    posicoes_t6 = np.flatnonzero(gatilhos & perdeu_t5) + 6
+    return posicoes_t6[posicoes_t6 < n - 15].tolist()
 
 
-def analisar_multiplicadores_apos_t6(multiplicadores: List[float], posicoes_t6: List[int]):
+def analisar_multiplicadores_apos_t6(multiplicadores: np.ndarray, posicoes_t6: List[int]):
     """Analisa os multiplicadores que aparecem apos T6"""
 
     # Para cada alvo, contar em quantas tentativas ele aparece
     alvos = [1.5, 1.75, 2.0, 2.25, 2.5, 2.75, 3.0, 3.5, 4.0, 5.0, 6.0, 8.0, 10.0, 15.0, 20.0]
 
+    # Janela das proximas 20 rodadas (T6 a T25) de cada gatilho: matriz N x 20.
+    # O final da serie e completado com -inf (rodada inexistente nunca acerta).
+    mults = np.concatenate([np.asarray(multiplicadores, dtype=MULT_DTYPE), np.full(20, -np.inf, dtype=MULT_DTYPE)])
+    janelas = np.lib.stride_tricks.sliding_window_view(mults, 20)[np.asarray(posicoes_t6, dtype=np.int64)]
+    total = len(posicoes_t6)
+
+    # Tentativa do primeiro acerto por alvo (T6 = 1); 0 quando nao acertou em 20
+    alvos_arr = np.asarray(alvos, dtype=MULT_DTYPE)
+    if NUMBA_AVAILABLE:
+        tentativas = _primeiro_acerto(np.ascontiguousarray(janelas), alvos_arr)
+    else:
+        # Todos os alvos de uma vez: tensor (alvos x N x 20)
+        hits = janelas[None, :, :] >= alvos_arr[:, None, None]
+        tentativas = np.where(hits.any(axis=2), hits.argmax(axis=2) + 1, 0)
+
+    # Em quantos casos acertou em exatamente N tentativas (linha = alvo, coluna = tentativa)
+    linhas = np.arange(len(alvos))[:, None] * 21
+    acertou_em_n = np.bincount((tentativas + linhas).ravel(), minlength=21 * len(alvos)).reshape(len(alvos), 21)
+    acertou_em_n[:, 0] = 0
+
+    # Acerto acumulado por tentativa (% ate a tentativa t, coluna = t)
+    acertou_total = acertou_em_n.sum(axis=1)
+    soma_tentativas = acertou_em_n @ np.arange(21)
+    if total:
+        acerto_acumulado = np.cumsum(acertou_em_n, axis=1) / total * 100.0
+    else:
+        acerto_acumulado = np.zeros((len(alvos), 21))
+
     # Estatisticas por alvo
     resultados = {}
 
-    for alvo in alvos:
-        tentativas_para_acertar = []
-        acertou_em_n = defaultdict(int)  # Em quantos casos acertou em exatamente N tentativas
-
-        for pos_t6 in posicoes_t6:
-            # Procurar o alvo nas proximas 20 rodadas (T6 a T25)
-            acertou = False
-            for t in range(20):
-                pos = pos_t6 + t
-                if pos < len(multiplicadores):
-                    m = multiplicadores[pos]
-                    if m >= alvo:
-                        tentativas_para_acertar.append(t + 1)  # T6 = tentativa 1
-                        acertou_em_n[t + 1] += 1
-                        acertou = True
-                        break
-
-            if not acertou:
-                tentativas_para_acertar.append(999)  # Nao acertou em 20 tentativas
-
-        # Calcular estatisticas
-        acertou_total = sum(1 for t in tentativas_para_acertar if t < 999)
-        taxa_acerto = acertou_total / len(posicoes_t6) * 100 if posicoes_t6 else 0
-
-        # Acerto acumulado por tentativa
-        acerto_acumulado = {}
-        acumulado = 0
-        for t in range(1, 21):
-            acumulado += acertou_em_n[t]
-            acerto_acumulado[t] = acumulado / len(posicoes_t6) * 100 if posicoes_t6 else 0
-
+    for i, alvo in enumerate(alvos):
+        n_acertos = int(acertou_total[i])
         resultados[alvo] = {
-            'taxa_acerto_20t': taxa_acerto,
-            'media_tentativas': statistics.mean([t for t in tentativas_para_acertar if t < 999]) if acertou_total > 0 else 999,
-            'acerto_acumulado': acerto_acumulado,
-            'acertou_em_n': dict(acertou_em_n)
+            'taxa_acerto_20t': n_acertos / total * 100 if total else 0,
+            'media_tentativas': soma_tentativas[i] / n_acertos if n_acertos > 0 else 999,
+            'acerto_acumulado': acerto_acumulado[i],
+            'acertou_em_n': acertou_em_n[i]
         }
 
     return resultados
 
 
+def tentativas_para_taxa(acerto_acumulado: np.ndarray, taxa: float):
+    """Primeira tentativa (1 a 20) em que o acerto acumulado atinge taxa%; None se nunca"""
+    atingiu = acerto_acumulado[1:21] >= taxa
+    if not atingiu.any():
+        return None
+    return int(atingiu.argmax()) + 1
+
+
 def main():
     csv_path = '/home/linnaldonitro/MartingaleV2_Build/brabet_unificado_1.3m_ate_20jan.csv'
 
@@ -182,13 +240,8 @@ def main():
         r = resultados[alvo]
 
         # Em quantas tentativas atinge 95%?
-        tent_95 = None
-        tent_99 = None
-        for t in range(1, 21):
-            if r['acerto_acumulado'][t] >= 95 and tent_95 is None:
-                tent_95 = t
-            if r['acerto_acumulado'][t] >= 99 and tent_99 is None:
-                tent_99 = t
+        tent_95 = tentativas_para_taxa(r['acerto_acumulado'], 95)
+        tent_99 = tentativas_para_taxa(r['acerto_acumulado'], 99)
 
         if tent_95 and tent_95 <= 10:
             print(f"\n  {alvo:.2f}x:")
@@ -218,12 +271,7 @@ def main():
         aposta_pct = consumido_ate_t5 / (alvo - 1)
         sobra = banca_restante - aposta_pct
 
-        r = resultados[alvo]
-        tent_95 = None
-        for t in range(1, 21):
-            if r['acerto_acumulado'][t] >= 95:
-                tent_95 = t
-                break
+        tent_95 = tentativas_para_taxa(resultados[alvo]['acerto_acumulado'], 95)
 
         tent_str = f"T{tent_95+5}" if tent_95 else ">T25"
 
@@ -12,16 +12,19 @@ Mudancas principais:
 """
 
 import time
+import queue
+import atexit
 import threading
 import json
 import sys
 import os
+import re
 
 # Som: winsound no Windows, alternativa no Linux
 if sys.platform == 'win32':
     import winsound
     def beep(freq, duration):
-        beep(freq, duration)
+        winsound.Beep(freq, duration)
 else:
     def beep(freq, duration):
         # Tentar usar paplay ou speaker-test no Linux
@@ -31,18 +34,36 @@ else:
             pass  # Ignorar se nao tiver som
 from datetime import datetime
 from typing import Dict, Optional, List
+import numpy as np
 from colorama import Fore, init
 from collections import deque
 
 # Importar utilitario de timezone (Brasilia) - apenas para display
 try:
-    from timezone_util import agora_str, horario as horario_brasilia
+    from timezone_util import agora_str, horario as horario_brasilia, BRASILIA_OFFSET
     TZ_UTIL = True
 except ImportError:
     TZ_UTIL = False
+    BRASILIA_OFFSET = None  # fromtimestamp(..., None) = horario local
     def agora_str(): return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     def horario_brasilia(): return datetime.now().strftime('%H:%M:%S')
 
+# orjson (opcional) para serializar a auditoria direto em bytes
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# requests (opcional) para o Telegram; importado aqui para nao pesar no 1o envio
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
 from vision_system import VisionSystem
 from martingale_session import (
     MartingaleSession, SessionState,
@@ -72,12 +93,22 @@ TELEGRAM_COMMANDS_FILE = os.path.join(os.path.dirname(__file__), 'telegram_comma
 # Flag de auto-restart para liberar memória
 AUTO_RESTART_FLAG = os.path.join(os.path.dirname(__file__), 'auto_restart.flag')
 
+# MACHINE_ID configurado no sync_client.py (usado por _detectar_machine_id)
+MACHINE_ID_RE = re.compile(r'MACHINE_ID\s*=\s*["\'](\w+)["\']')
+
 # Arquivo de auditoria (log de decisoes para diagnostico)
 AUDIT_LOG_FILE = os.path.join(os.path.dirname(__file__), 'audit_log.jsonl')
 
 # Intervalo para auto-restart (em segundos) - DESATIVADO
 # Era 6 horas, agora desativado (1 ano = nunca vai acontecer)
 AUTO_RESTART_INTERVAL = 365 * 24 * 60 * 60  # 1 ano
+
+# Linha separadora dos blocos de log (montada uma vez)
+SEPARADOR = '=' * 50
+
+# Modos sem reserva/aceleracao (100% da banca) e modos com upgrade automatico de nivel
+MODOS_SEM_RESERVA = frozenset((ModoOperacao.NS7_PURO, ModoOperacao.G6_NS9, ModoOperacao.G6_NS10))
+MODOS_COM_UPGRADE = frozenset((ModoOperacao.AUTOMATICO, ModoOperacao.G6_NS9, ModoOperacao.G6_NS10))
 from autonomous_betting_v2 import AutonomousBettingV2
 # UI Rich (nova interface elegante)
 try:
@@ -90,6 +121,33 @@ from refresh_manager import RefreshManager
 init(autoreset=True)
 
 
+class HistoricoMultiplicadores:
+    """Buffer circular de multiplicadores (array float64 pre-alocado)"""
+
+    def __init__(self, tamanho: int = 1000):
+        self._dados = np.zeros(tamanho, dtype=np.float64)
+        self._idx = 0
+        self._preenchido = 0
+
+    def append(self, valor: float):
+        """Adiciona multiplicador, sobrescrevendo o mais antigo quando cheio"""
+        self._dados[self._idx] = valor
+        self._idx = (self._idx + 1) % len(self._dados)
+        if self._preenchido < len(self._dados):
+            self._preenchido += 1
+
+    def __len__(self) -> int:
+        return self._preenchido
+
+    def recent(self, n: int = None) -> np.ndarray:
+        """Copia dos ultimos n multiplicadores (todos se n=None), do mais antigo ao mais recente"""
+        n = self._preenchido if n is None else min(n, self._preenchido)
+        inicio = self._idx - n
+        if inicio >= 0:
+            return self._dados[inicio:self._idx].copy()
+        return np.concatenate((self._dados[inicio:], self._dados[:self._idx]))
+
+
 class RallyDetector:
     """Detecta padroes de rally baseado em frequencia de triggers"""
 
@@ -103,78 +161,76 @@ class RallyDetector:
         'normal_max': 1.25,  # > 125% do baseline = > 64 min
     }
 
+    # Limites em minutos (constantes: calculados uma vez)
+    LIMITE_RALLY = BASELINE_INTERVALO * THRESHOLDS['rally']
+    LIMITE_QUENTE = BASELINE_INTERVALO * THRESHOLDS['quente']
+    LIMITE_LENTO = BASELINE_INTERVALO * THRESHOLDS['normal_max']
+
+    # Codigos inteiros de estado; nomes/icones so na saida (to_dict / UI)
+    RALLY, QUENTE, NORMAL, LENTO = range(4)
+    ESTADOS = ('rally', 'quente', 'normal', 'lento')
+    ICONES = ('RALLY', 'QUENTE', 'NORMAL', 'LENTO')
+
     def __init__(self):
-        self.trigger_timestamps: List[datetime] = []
         self.max_history = 10  # Manter ultimos 10 triggers
+        # Epoch (segundos) de cada trigger; deque descarta os mais antigos
+        self.trigger_timestamps: deque = deque(maxlen=self.max_history)
 
     def registrar_trigger(self, timestamp: datetime = None):
         """Registra um novo trigger"""
-        ts = timestamp or datetime.now()
-        self.trigger_timestamps.append(ts)
-        # Manter apenas os ultimos N
-        if len(self.trigger_timestamps) > self.max_history:
-            self.trigger_timestamps = self.trigger_timestamps[-self.max_history:]
-
-    def get_ultimo_intervalo(self) -> float:
-        """Retorna intervalo desde o ultimo trigger em minutos"""
+        self.trigger_timestamps.append(timestamp.timestamp() if timestamp else time.time())
+
+    def get_ultimo_intervalo(self, agora: float = None) -> float:
+        """Retorna intervalo desde o ultimo trigger em minutos (agora = epoch opcional)"""
         if not self.trigger_timestamps:
             return float('inf')
-        ultimo = self.trigger_timestamps[-1]
-        agora = datetime.now()
-        return (agora - ultimo).total_seconds() / 60
+        return ((agora or time.time()) - self.trigger_timestamps[-1]) / 60
 
     def get_media_intervalos(self, n: int = 3) -> float:
         """Retorna media dos ultimos N intervalos em minutos"""
-        if len(self.trigger_timestamps) < 2:
+        total = len(self.trigger_timestamps)
+        if total < 2:
             return float('inf')
 
-        intervalos = []
-        timestamps = self.trigger_timestamps[-min(n+1, len(self.trigger_timestamps)):]
-        for i in range(1, len(timestamps)):
-            delta = (timestamps[i] - timestamps[i-1]).total_seconds() / 60
-            intervalos.append(delta)
+        # Soma dos intervalos consecutivos = ultimo - primeiro da janela
+        n = min(n, total - 1)
+        return (self.trigger_timestamps[-1] - self.trigger_timestamps[-1 - n]) / n / 60
+
+    def _codigo_para(self, intervalo: float) -> int:
+        if intervalo < self.LIMITE_RALLY:
+            return self.RALLY
+        elif intervalo < self.LIMITE_QUENTE:
+            return self.QUENTE
+        elif intervalo > self.LIMITE_LENTO:
+            return self.LENTO
+        else:
+            return self.NORMAL
 
-        return sum(intervalos) / len(intervalos) if intervalos else float('inf')
+    def get_codigo_estado(self, agora: float = None) -> int:
+        """Retorna codigo do estado atual (RALLY, QUENTE, NORMAL, LENTO)"""
+        return self._codigo_para(self.get_ultimo_intervalo(agora))
 
-    def get_estado(self) -> str:
+    def get_estado(self, agora: float = None) -> str:
         """Retorna estado atual: rally, quente, normal, lento"""
-        intervalo = self.get_ultimo_intervalo()
-
-        limite_rally = self.BASELINE_INTERVALO * self.THRESHOLDS['rally']
-        limite_quente = self.BASELINE_INTERVALO * self.THRESHOLDS['quente']
-        limite_lento = self.BASELINE_INTERVALO * self.THRESHOLDS['normal_max']
-
-        if intervalo < limite_rally:
-            return 'rally'
-        elif intervalo < limite_quente:
-            return 'quente'
-        elif intervalo > limite_lento:
-            return 'lento'
-        else:
-            return 'normal'
+        return self.ESTADOS[self.get_codigo_estado(agora)]
 
     def get_estado_icon(self) -> str:
         """Retorna icone do estado"""
-        estado = self.get_estado()
-        icons = {
-            'rally': 'RALLY',
-            'quente': 'QUENTE',
-            'normal': 'NORMAL',
-            'lento': 'LENTO'
-        }
-        return icons.get(estado, 'NORMAL')
+        return self.ICONES[self.get_codigo_estado()]
 
-    def to_dict(self) -> Dict:
+    def to_dict(self, agora: float = None) -> Dict:
         """Exporta para dicionario"""
+        intervalo = self.get_ultimo_intervalo(agora)
+        codigo = self._codigo_para(intervalo)
         return {
-            'estado': self.get_estado(),
-            'estado_icon': self.get_estado_icon(),
-            'ultimo_intervalo': self.get_ultimo_intervalo(),
+            'estado': self.ESTADOS[codigo],
+            'estado_icon': self.ICONES[codigo],
+            'ultimo_intervalo': intervalo,
             'media_3_intervalos': self.get_media_intervalos(3),
             'total_triggers': len(self.trigger_timestamps),
             'baseline': self.BASELINE_INTERVALO,
-            'limite_rally': self.BASELINE_INTERVALO * self.THRESHOLDS['rally'],
-            'limite_quente': self.BASELINE_INTERVALO * self.THRESHOLDS['quente'],
+            'limite_rally': self.LIMITE_RALLY,
+            'limite_quente': self.LIMITE_QUENTE,
         }
 
 
@@ -194,6 +250,23 @@ class EstatisticasValidacao:
         'zerou_banca': 0.0,
     }
 
+    # Campo -> (contador, amostra) usado nas porcentagens
+    CAMPOS = {
+        'resolveu_t1_t4': ('resolveu_t1_t4', 'gatilhos_total'),
+        'foi_t5': ('foi_t5', 'gatilhos_total'),
+        't5_cenario_a': ('t5_cenario_a', 'foi_t5'),
+        't5_cenario_b': ('t5_cenario_b', 'foi_t5'),
+        't5_cenario_c': ('t5_cenario_c', 'foi_t5'),
+        't6_win': ('t6_win', 't6_total'),
+        't6_loss': ('t6_loss', 't6_total'),
+        'sangrou_60': ('sangrou_60', 'gatilhos_total'),
+        'zerou_banca': ('zerou_banca', 'gatilhos_total'),
+    }
+
+    # Codigos de status; simbolos so na saida
+    STATUS_OK, STATUS_MARGEM, STATUS_FORA = range(3)
+    STATUS = ('ok', '?', 'X')
+
     def __init__(self):
         # Contadores de gatilhos
         self.gatilhos_total = 0
@@ -214,13 +287,18 @@ class EstatisticasValidacao:
         self.sangrou_60 = 0
         self.zerou_banca = 0
 
+        # Ultimo to_dict(); descartado a cada registrar_*
+        self._cache_dict: Optional[Dict] = None
+
     def registrar_win_t1_t4(self, tentativa: int):
         """Registra WIN em T1-T4"""
+        self._cache_dict = None
         self.gatilhos_total += 1
         self.resolveu_t1_t4 += 1
 
     def registrar_t5(self, cenario: str):
         """Registra resultado em T5"""
+        self._cache_dict = None
         self.gatilhos_total += 1
         self.foi_t5 += 1
         if cenario == 'A':
@@ -232,6 +310,7 @@ class EstatisticasValidacao:
 
     def registrar_t6_plus(self, ganhou: bool):
         """Registra resultado em T6+"""
+        self._cache_dict = None
         self.t6_total += 1
         if ganhou:
             self.t6_win += 1
@@ -240,64 +319,62 @@ class EstatisticasValidacao:
 
     def registrar_sangrou(self):
         """Registra sangria de -60%"""
+        self._cache_dict = None
         self.sangrou_60 += 1
 
     def registrar_zerou(self):
         """Registra banca zerada"""
+        self._cache_dict = None
         self.zerou_banca += 1
 
     def get_porcentagem(self, campo: str) -> float:
         """Calcula porcentagem real"""
-        if campo == 'resolveu_t1_t4':
-            return (self.resolveu_t1_t4 / self.gatilhos_total * 100) if self.gatilhos_total > 0 else 0
-        elif campo == 'foi_t5':
-            return (self.foi_t5 / self.gatilhos_total * 100) if self.gatilhos_total > 0 else 0
-        elif campo == 't5_cenario_a':
-            return (self.t5_cenario_a / self.foi_t5 * 100) if self.foi_t5 > 0 else 0
-        elif campo == 't5_cenario_b':
-            return (self.t5_cenario_b / self.foi_t5 * 100) if self.foi_t5 > 0 else 0
-        elif campo == 't5_cenario_c':
-            return (self.t5_cenario_c / self.foi_t5 * 100) if self.foi_t5 > 0 else 0
-        elif campo == 't6_win':
-            return (self.t6_win / self.t6_total * 100) if self.t6_total > 0 else 0
-        elif campo == 't6_loss':
-            return (self.t6_loss / self.t6_total * 100) if self.t6_total > 0 else 0
-        elif campo == 'sangrou_60':
-            return (self.sangrou_60 / self.gatilhos_total * 100) if self.gatilhos_total > 0 else 0
-        elif campo == 'zerou_banca':
-            return (self.zerou_banca / self.gatilhos_total * 100) if self.gatilhos_total > 0 else 0
-        return 0
+        par = self.CAMPOS.get(campo)
+        if par is None:
+            return 0
+        total = getattr(self, par[1])
+        return (getattr(self, par[0]) / total * 100) if total > 0 else 0
 
     def get_amostra(self, campo: str) -> int:
         """Retorna tamanho da amostra para o campo"""
-        if campo in ['resolveu_t1_t4', 'foi_t5', 'sangrou_60', 'zerou_banca']:
-            return self.gatilhos_total
-        elif campo.startswith('t5_'):
-            return self.foi_t5
-        elif campo.startswith('t6_'):
-            return self.t6_total
-        return 0
-
-    def get_status(self, campo: str) -> str:
-        """Retorna simbolo de status (check/warning/error)"""
+        par = self.CAMPOS.get(campo)
+        return getattr(self, par[1]) if par else 0
+
+    def get_codigo_status(self, campo: str, real: float = None) -> int:
+        """Retorna codigo de status (STATUS_OK/STATUS_MARGEM/STATUS_FORA)"""
         amostra = self.get_amostra(campo)
         if amostra < 10:
-            return '?'  # Amostra pequena
+            return self.STATUS_MARGEM  # Amostra pequena
 
-        real = self.get_porcentagem(campo)
+        if real is None:
+            real = self.get_porcentagem(campo)
         esperado = self.ESPERADO.get(campo, 0)
         diferenca = abs(real - esperado)
 
         if diferenca <= 5:
-            return 'ok'  # Dentro do esperado
+            return self.STATUS_OK  # Dentro do esperado
         elif diferenca <= 10:
-            return '?'  # Margem
+            return self.STATUS_MARGEM  # Margem
         else:
-            return 'X'  # Fora do esperado
+            return self.STATUS_FORA  # Fora do esperado
+
+    def get_status(self, campo: str, real: float = None) -> str:
+        """Retorna simbolo de status (check/warning/error)"""
+        return self.STATUS[self.get_codigo_status(campo, real)]
 
     def to_dict(self) -> Dict:
-        """Exporta estatisticas para dicionario"""
-        return {
+        """Exporta estatisticas para dicionario (reaproveitado enquanto nada mudar)"""
+        if self._cache_dict is not None:
+            return self._cache_dict
+
+        # Cada porcentagem e calculada uma vez e reaproveitada no status
+        pct_t1_t4 = self.get_porcentagem('resolveu_t1_t4')
+        pct_t5 = self.get_porcentagem('foi_t5')
+        pct_t5_a = self.get_porcentagem('t5_cenario_a')
+        pct_t5_b = self.get_porcentagem('t5_cenario_b')
+        pct_t5_c = self.get_porcentagem('t5_cenario_c')
+        pct_t6_win = self.get_porcentagem('t6_win')
+        self._cache_dict = {
             'gatilhos_total': self.gatilhos_total,
             'resolveu_t1_t4': self.resolveu_t1_t4,
             'foi_t5': self.foi_t5,
@@ -310,23 +387,24 @@ class EstatisticasValidacao:
             'sangrou_60': self.sangrou_60,
             'zerou_banca': self.zerou_banca,
             # Porcentagens calculadas
-            'pct_resolveu_t1_t4': self.get_porcentagem('resolveu_t1_t4'),
-            'pct_foi_t5': self.get_porcentagem('foi_t5'),
-            'pct_t5_a': self.get_porcentagem('t5_cenario_a'),
-            'pct_t5_b': self.get_porcentagem('t5_cenario_b'),
-            'pct_t5_c': self.get_porcentagem('t5_cenario_c'),
-            'pct_t6_win': self.get_porcentagem('t6_win'),
+            'pct_resolveu_t1_t4': pct_t1_t4,
+            'pct_foi_t5': pct_t5,
+            'pct_t5_a': pct_t5_a,
+            'pct_t5_b': pct_t5_b,
+            'pct_t5_c': pct_t5_c,
+            'pct_t6_win': pct_t6_win,
             'pct_t6_loss': self.get_porcentagem('t6_loss'),
             # Status
-            'status_t1_t4': self.get_status('resolveu_t1_t4'),
-            'status_t5': self.get_status('foi_t5'),
-            'status_t5_a': self.get_status('t5_cenario_a'),
-            'status_t5_b': self.get_status('t5_cenario_b'),
-            'status_t5_c': self.get_status('t5_cenario_c'),
-            'status_t6_win': self.get_status('t6_win'),
+            'status_t1_t4': self.get_status('resolveu_t1_t4', pct_t1_t4),
+            'status_t5': self.get_status('foi_t5', pct_t5),
+            'status_t5_a': self.get_status('t5_cenario_a', pct_t5_a),
+            'status_t5_b': self.get_status('t5_cenario_b', pct_t5_b),
+            'status_t5_c': self.get_status('t5_cenario_c', pct_t5_c),
+            'status_t6_win': self.get_status('t6_win', pct_t6_win),
             # Esperado
             'esperado': self.ESPERADO,
         }
+        return self._cache_dict
 
 
 class HybridSystemV2:
@@ -338,9 +416,15 @@ class HybridSystemV2:
         self.config_path = config_path
         self.config = self.load_config()
         self.silent_mode = silent_mode  # Quando True, suprime todos os prints
+        if silent_mode:
+            self._log = self._log_silencioso  # Sem checar a flag a cada chamada
 
         # Configuracao de modo de operacao
         self.config_modo = config_modo or ConfiguracaoModo()
+        self._atualizar_flags_modo()
+        # Nomes usados nas mensagens de inicializacao (calculados uma vez)
+        nivel_nome = NIVEIS_SEGURANCA[self.config_modo.nivel_inicial]['nome']
+        modo_nome = self.config_modo.modo.value.upper().replace('_', '+')
 
         # Estado da sessao para persistencia
         self.estado_anterior = estado_anterior
@@ -348,7 +432,7 @@ class HybridSystemV2:
 
         self._log(f"\n{Fore.CYAN}{'='*60}")
         self._log(f"{Fore.CYAN}       SISTEMA MARTINGALE V2")
-        self._log(f"{Fore.CYAN}       {NIVEIS_SEGURANCA[self.config_modo.nivel_inicial]['nome']} | {self.config_modo.modo.value.upper()}")
+        self._log(f"{Fore.CYAN}       {nivel_nome} | {self.config_modo.modo.value.upper()}")
         self._log(f"{Fore.CYAN}{'='*60}\n")
 
         # ===== SELECAO DE PERFIL =====
@@ -387,7 +471,7 @@ class HybridSystemV2:
             # Modos normais: usar nivel de seguranca
             self.martingale.set_nivel_seguranca(self.config_modo.nivel_inicial)
             self.martingale.alvo_defesa = self.config_modo.alvo_defesa  # 1.25x default
-            self._log(f"{Fore.GREEN}Nivel de Seguranca: {NIVEIS_SEGURANCA[self.config_modo.nivel_inicial]['nome']}")
+            self._log(f"{Fore.GREEN}Nivel de Seguranca: {nivel_nome}")
 
         # ===== COMPONENTES =====
         self.regime_detector = RegimeDetector()
@@ -395,9 +479,8 @@ class HybridSystemV2:
         self.aceleracao_manager = AceleracaoManager()  # Estrategia [7,7,6]
 
         # Desativar aceleracao [7,7,6] para modos que nao usam
-        if self.config_modo.modo in [ModoOperacao.NS7_PURO, ModoOperacao.G6_NS9, ModoOperacao.G6_NS10]:
+        if self._modo_sem_reserva:
             self.aceleracao_manager.ativar(False)
-            modo_nome = self.config_modo.modo.value.upper().replace('_', '+')
             self._log(f"{Fore.YELLOW}Aceleracao [7,7,6] DESATIVADA ({modo_nome})")
         # Carregar estado da aceleracao se existir (para modos [7,7,6])
         elif self.aceleracao_manager.carregar():
@@ -420,15 +503,29 @@ class HybridSystemV2:
         # ===== AUTO-REFRESH =====
         # Carregar configuração de máquina (browser, etc)
         browser = 'firefox'  # Padrão
+        self._machine_config: Dict = {}  # Lido uma vez; reutilizado em _detectar_machine_id
+        self._machine_id: Optional[str] = None  # Calculado na 1a chamada de _detectar_machine_id
         machine_config_path = os.path.join(os.path.dirname(__file__), 'machine_config.json')
-        if os.path.exists(machine_config_path):
-            try:
-                with open(machine_config_path, 'r') as f:
-                    machine_config = json.load(f)
-                    browser = machine_config.get('browser', 'firefox')
-                    self._log(f"{Fore.CYAN}Navegador configurado: {browser}")
-            except Exception as e:
-                self._log(f"{Fore.YELLOW}Aviso ao ler machine_config.json: {e}")
+        try:
+            with open(machine_config_path, 'r') as f:
+                self._machine_config = json.load(f)
+                browser = self._machine_config.get('browser', 'firefox')
+                self._log(f"{Fore.CYAN}Navegador configurado: {browser}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self._log(f"{Fore.YELLOW}Aviso ao ler machine_config.json: {e}")
+
+        # Cache do telegram_config.json (relido apenas quando o mtime muda)
+        self._tg_config_file = os.path.join(os.path.dirname(__file__), 'telegram_config.json')
+        self._tg_config_cache: Dict = {}
+        self._tg_config_mtime = 0
+        self._tg_url = None
+        self._tg_cmds_mtime = None  # mtime_ns do telegram_commands.json ja processado
+        self._tg_session = self._criar_tg_session() if REQUESTS_AVAILABLE else None
+        # Envios vao para uma fila; thread dedicada faz o POST (callbacks nao esperam a rede)
+        self._tg_queue = queue.Queue()
+        threading.Thread(target=self._tg_worker, daemon=True).start()
         self.refresh_manager = RefreshManager(browser=browser)
         self.setup_refresh_callbacks()
 
@@ -440,13 +537,49 @@ class HybridSystemV2:
         self.total_rodadas = 0
 
         # ===== BUFFER E THREADING =====
-        self.frame_buffer = deque(maxlen=10)
-        self.buffer_lock = threading.Lock()
-        self.last_bet_detection_time = 0
+        # Produtor unico (captura) e consumidor unico (deteccao de BET):
+        # so o ultimo valor valido importa; atribuir a tupla e atomico sob o GIL
+        self._latest_mult: Optional[tuple] = None  # (timestamp, valor)
+        self.frame_ready = threading.Event()  # Sinalizado a cada frame novo capturado
+        self._parar_event = threading.Event()  # Sinalizado em stop(): threads acordam na hora
+        self.last_bet_detection_time = float('-inf')  # time.monotonic()
+
+        # ===== AUDITORIA =====
+        # Eventos vao para uma fila; thread dedicada grava em lote no arquivo
+        # (handle unico aberto, um writelines+flush por lote). A mesma fila
+        # aceita callables: outras gravacoes (ex.: log de refresh) feitas nessa thread
+        self._audit_queue = queue.Queue()
+        self._audit_lock = threading.Lock()
+        self._audit_ts_cache = (None, '')  # (segundo epoch, string Brasilia) - 1 strftime por segundo
+        try:
+            self._audit_fh = open(AUDIT_LOG_FILE, 'ab', buffering=64 * 1024)  # Binario: linhas ja em UTF-8
+        except OSError:
+            self._audit_fh = None
+        try:
+            os.makedirs("logs", exist_ok=True)
+            self._refresh_log_fh = open("logs/refresh_log.txt", "a", encoding="utf-8")
+        except OSError:
+            self._refresh_log_fh = None
+        threading.Thread(target=self._audit_writer, daemon=True).start()
+        atexit.register(self._audit_close)
+
+        # ===== ESTADO DA SESSAO =====
+        # salvar_estado so guarda o ultimo EstadoSessao; uma thread grava no disco
+        # apos 500ms sem novas chamadas (rajadas viram uma escrita)
+        self._estado_pendente: Optional[EstadoSessao] = None
+        self._estado_lock = threading.Lock()  # Tambem serializa as escritas no arquivo
+        self._estado_event = threading.Event()
+        threading.Thread(target=self._estado_writer, daemon=True).start()
+        atexit.register(self._estado_flush)
+
+        # ===== SOM =====
+        # Beeps bloqueiam (winsound.Beep); uma thread fixa toca a fila em ordem
+        self._som_queue = queue.Queue()
+        threading.Thread(target=self._som_worker, daemon=True).start()
 
         # ===== HISTORICO =====
-        self.multiplier_history = deque(maxlen=1000)  # Limitado para evitar memory leak
-        self.historico_apostas = []  # Lista de apostas para a interface
+        self.multiplier_history = HistoricoMultiplicadores(1000)  # Limitado para evitar memory leak
+        self.historico_apostas = deque(maxlen=500)  # Apostas para a interface (mais antigas saem sozinhas)
 
         # ===== ESTATISTICAS =====
         self.stats = {
@@ -465,10 +598,10 @@ class HybridSystemV2:
 
         # ===== CONTROLE DE APOSTAS =====
         self.last_bet_id = None
-        self.last_bet_ids = {}  # Armazena info de TODOS os slots
+        self.last_bet_ids: Dict[int, Dict] = {}  # Armazena info de TODOS os slots
 
         # ===== AUTO-RESTART PARA LIBERAR MEMÓRIA =====
-        self.auto_restart_timestamp = time.time()  # Quando iniciou
+        self.auto_restart_timestamp = time.monotonic()  # Quando iniciou (so para medir intervalo)
         self.auto_restart_pending = False  # Se tem reinício pendente
         self.ultimo_multiplicador = 0.0  # Para verificar momento seguro
 
@@ -490,10 +623,10 @@ class HybridSystemV2:
             if self.estado_anterior:
                 self.restaurar_estado()
                 # Validar se saldo atual bate aproximadamente com o esperado
-                diff = abs(saldo_capturado - self.estado_anterior.saldo_atual)
-                if diff > 50:  # Diferenca maior que R$50
-                    print(f"{Fore.YELLOW}ATENCAO: Saldo atual (R$ {saldo_capturado:.2f}) difere do esperado (R$ {self.estado_anterior.saldo_atual:.2f})")
-                    print(f"{Fore.YELLOW}Usando saldo atual da tela.")
+                esperado = self.estado_anterior.saldo_atual
+                if not -50 <= saldo_capturado - esperado <= 50:  # Diferenca maior que R$50
+                    self._log(f"{Fore.YELLOW}ATENCAO: Saldo atual (R$ {saldo_capturado:.2f}) difere do esperado (R$ {esperado:.2f})", force=True)
+                    self._log(f"{Fore.YELLOW}Usando saldo atual da tela.", force=True)
             else:
                 self.deposito_inicial = saldo_capturado
 
@@ -510,9 +643,7 @@ class HybridSystemV2:
 
         # ===== INICIALIZAR RESERVA DE LUCROS =====
         # NS7_PURO, G6_NS9, G6_NS10: sem reserva - usar 100% da banca
-        modos_sem_reserva = [ModoOperacao.NS7_PURO, ModoOperacao.G6_NS9, ModoOperacao.G6_NS10]
-        if self.config_modo.modo in modos_sem_reserva:
-            modo_nome = self.config_modo.modo.value.upper().replace('_', '+')
+        if self._modo_sem_reserva:
             self._log(f"{Fore.MAGENTA}{modo_nome}: Reserva DESATIVADA - 100% banca operacional")
             # Inicializar com reserva zerada
             self.reserva_manager.inicializar(self.saldo_atual)
@@ -534,7 +665,7 @@ class HybridSystemV2:
             self._log(f"{Fore.GREEN}Nova sessao - Reserva zerada, banca base: R$ {self.saldo_atual:.2f}")
 
         # Modos sem reserva: nao mostrar meta
-        if self.config_modo.modo not in modos_sem_reserva:
+        if not self._modo_sem_reserva:
             self._log(f"{Fore.CYAN}Meta 10%: R$ {self.reserva_manager.get_meta_valor():.2f}")
 
         # Salvar estado inicial
@@ -548,73 +679,215 @@ class HybridSystemV2:
         if not self.silent_mode or force:
             print(msg)
 
-    def _audit(self, evento: str, dados: Dict):
+    def _log_silencioso(self, msg: str, force: bool = False):
+        """_log usado com silent_mode=True: so exibe mensagens forcadas"""
+        if force:
+            print(msg)
+
+    def _atualizar_flags_modo(self):
+        """Recalcula flags derivadas do modo (chamar sempre que config_modo.modo mudar)"""
+        modo = self.config_modo.modo
+        self._modo_sem_reserva = modo in MODOS_SEM_RESERVA
+        self._modo_com_upgrade = modo in MODOS_COM_UPGRADE
+
+    def _audit(self, evento: str, dados, ts: float = None):
         """
         Registra evento de auditoria em arquivo JSONL (uma linha por evento).
         Leve e auditavel - nao carrega arquivo na memoria.
+        Apenas enfileira o epoch (ts ou agora); a formatacao e a gravacao
+        sao feitas pela thread _audit_writer.
+        dados pode ser um dict ou uma funcao que o monta: so e chamada
+        se o arquivo de auditoria estiver aberto.
         """
+        if self._audit_fh is None:
+            return
+        if callable(dados):
+            dados = dados()
+        self._audit_queue.put((ts or time.time(), evento, dados))
+
+    def _audit_ts(self, ts: float) -> str:
+        """Formata epoch em horario de Brasilia, reaproveitando a string do mesmo segundo"""
+        segundo = int(ts)
+        cache = self._audit_ts_cache
+        if cache[0] != segundo:
+            cache = (segundo, datetime.fromtimestamp(segundo, BRASILIA_OFFSET).strftime('%Y-%m-%d %H:%M:%S'))
+            self._audit_ts_cache = cache
+        return cache[1]
+
+    def _audit_writer(self):
+        """Thread de auditoria: espera eventos e grava tudo que estiver na fila"""
+        while True:
+            lote = [self._audit_queue.get()]
+            try:
+                while True:
+                    lote.append(self._audit_queue.get_nowait())
+            except queue.Empty:
+                pass
+            self._audit_gravar(lote)
+
+    def _audit_executar(self, lote: List) -> List[tuple]:
+        """Executa as tarefas (callables) do lote e retorna so os eventos de auditoria"""
+        eventos = []
+        for item in lote:
+            if callable(item):
+                try:
+                    item()
+                except Exception as e:
+                    self._log(f"{Fore.RED}Erro em gravacao de fundo: {e}")
+            else:
+                eventos.append(item)
+        return eventos
+
+    @staticmethod
+    def _audit_linha(registro: Dict) -> bytes:
+        """Serializa um registro de auditoria como linha JSONL em UTF-8"""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(registro, option=orjson.OPT_APPEND_NEWLINE)
+        return (json.dumps(registro, ensure_ascii=False) + '\n').encode('utf-8')
+
+    def _audit_gravar(self, lote: List):
+        """Grava um lote de eventos (timestamp, evento, dados) no JSONL"""
+        lote = self._audit_executar(lote)
+        if not lote:
+            return
         try:
-            registro = {
-                'timestamp': agora_str(),  # Brasilia
-                'evento': evento,
-                **dados
-            }
-            with open(AUDIT_LOG_FILE, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(registro, ensure_ascii=False) + '\n')
+            linhas = [
+                self._audit_linha({'timestamp': self._audit_ts(ts), 'evento': evento, **dados})
+                for ts, evento, dados in lote
+            ]
+            with self._audit_lock:
+                self._audit_fh.writelines(linhas)
+                self._audit_fh.flush()
         except Exception as e:
             pass  # Silencioso - auditoria nao pode travar o bot
 
-    def _som_trigger(self):
-        """Som de notificacao quando gatilho e atingido - beep agudo curto"""
+    def _audit_close(self):
+        """Grava eventos ainda na fila e fecha o arquivo (encerramento)"""
+        lote = []
         try:
-            threading.Thread(target=lambda: beep(1500, 200), daemon=True).start()
-        except:
+            while True:
+                lote.append(self._audit_queue.get_nowait())
+        except queue.Empty:
             pass
+        if lote:
+            self._audit_gravar(lote)
+        with self._audit_lock:
+            if self._audit_fh:
+                self._audit_fh.close()
+                self._audit_fh = None
+        if self._refresh_log_fh:
+            self._refresh_log_fh.close()
+            self._refresh_log_fh = None
+
+    def _som_worker(self):
+        """Thread de som: toca os beeps (freq, duracao) enfileirados"""
+        while True:
+            freq, duracao = self._som_queue.get()
+            try:
+                beep(freq, duracao)
+            except:
+                pass
+
+    def _som_trigger(self):
+        """Som de notificacao quando gatilho e atingido - beep agudo curto"""
+        self._som_queue.put((1500, 200))
 
     def _som_win(self):
         """Som de notificacao quando aposta ganha - beep grave longo"""
+        self._som_queue.put((800, 400))
+
+    def _get_tg_config(self) -> Dict:
+        """Retorna telegram_config.json, relendo apenas se o mtime mudou"""
         try:
-            threading.Thread(target=lambda: beep(800, 400), daemon=True).start()
-        except:
-            pass
+            mtime = os.stat(self._tg_config_file).st_mtime
+        except OSError:
+            self._tg_config_cache, self._tg_config_mtime = {}, 0
+            return self._tg_config_cache
+        if mtime != self._tg_config_mtime:
+            try:
+                with open(self._tg_config_file, 'r') as f:
+                    self._tg_config_cache = json.load(f)
+                self._tg_config_mtime = mtime
+                token = self._tg_config_cache.get('token')
+                self._tg_url = f"https://api.telegram.org/bot{token}/sendMessage" if token else None
+            except Exception:
+                self._tg_config_cache, self._tg_config_mtime = {}, 0
+        return self._tg_config_cache
+
+    def _tg_post(self, chat_id, msg: str, descricao: Optional[str] = None):
+        """Enfileira mensagem HTML para envio assincrono pelo _tg_worker
+
+        Args:
+            descricao: se informada, o worker loga sucesso/falha do envio com ela
+        """
+        self._tg_queue.put((self._tg_url, chat_id, msg, descricao))
+
+    def _tg_worker(self):
+        """Thread do Telegram: envia as mensagens enfileiradas em ordem"""
+        while True:
+            url, chat_id, msg, descricao = self._tg_queue.get()
+            try:
+                self._tg_enviar(url, chat_id, msg)
+            except Exception as e:
+                alvo = descricao or "Telegram"
+                self._log(f"{Fore.YELLOW}Aviso: Não foi possível enviar {alvo}: {e}")
+            else:
+                if descricao:
+                    self._log(f"{Fore.GREEN}{descricao} enviada via Telegram")
+
+    @staticmethod
+    def _criar_tg_session():
+        """requests.Session persistente (keep-alive) para a API do Telegram"""
+        sessao = requests.Session()
+        # Repete so falhas de conexao (sendMessage nao e idempotente)
+        retry = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.5)
+        sessao.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=retry))
+        return sessao
+
+    def _tg_enviar(self, url: str, chat_id, msg: str):
+        """Envia mensagem HTML pela sessao HTTP persistente do Telegram (bloqueante)"""
+        if self._tg_session is None:
+            raise RuntimeError("requests nao instalado")
+        resp = self._tg_session.post(url, data={'chat_id': chat_id, 'text': msg, 'parse_mode': 'HTML'}, timeout=5)
+        resp.raise_for_status()
 
     def _telegram_enabled(self) -> bool:
         """Verifica se Telegram está habilitado nesta máquina"""
-        try:
-            config_file = os.path.join(os.path.dirname(__file__), 'telegram_config.json')
-            if os.path.exists(config_file):
-                with open(config_file, 'r') as f:
-                    tg_config = json.load(f)
-                return tg_config.get('enabled', True) and tg_config.get('token')
-            return False
-        except:
-            return False
+        tg_config = self._get_tg_config()
+        return tg_config.get('enabled', True) and tg_config.get('token')
 
     def _enviar_confirmacao_refresh(self, multiplicador: float):
         """Envia confirmação via Telegram que o bot voltou após refresh"""
         if not self._telegram_enabled():
             return
         try:
-            import requests
-            config_file = os.path.join(os.path.dirname(__file__), 'telegram_config.json')
-            if os.path.exists(config_file):
-                with open(config_file, 'r') as f:
-                    tg_config = json.load(f)
-                token = tg_config.get('token')
-                chat_id = tg_config.get('chat_id')
-                if token and chat_id:
-                    hora = horario_brasilia() if TZ_UTIL else datetime.now().strftime('%H:%M:%S')
-                    msg = f"✅ <b>REFRESH OK - BOT OPERANTE</b>\n\n"
-                    msg += f"⏰ Horário: {hora}\n"
-                    msg += f"🎯 Primeiro multiplicador: {multiplicador:.2f}x\n"
-                    msg += f"💰 Saldo: R$ {self.saldo_atual:.2f}"
-
-                    url = f"https://api.telegram.org/bot{token}/sendMessage"
-                    requests.post(url, data={'chat_id': chat_id, 'text': msg, 'parse_mode': 'HTML'}, timeout=5)
-                    self._log(f"{Fore.GREEN}Confirmação pós-refresh enviada via Telegram")
+            tg_config = self._get_tg_config()
+            token = tg_config.get('token')
+            chat_id = tg_config.get('chat_id')
+            if token and chat_id:
+                hora = horario_brasilia() if TZ_UTIL else datetime.now().strftime('%H:%M:%S')
+                msg = f"✅ <b>REFRESH OK - BOT OPERANTE</b>\n\n"
+                msg += f"⏰ Horário: {hora}\n"
+                msg += f"🎯 Primeiro multiplicador: {multiplicador:.2f}x\n"
+                msg += f"💰 Saldo: R$ {self.saldo_atual:.2f}"
+
+                # Sucesso/falha logados pelo _tg_worker depois do POST
+                self._tg_post(chat_id, msg, "Confirmação pós-refresh")
         except Exception as e:
             self._log(f"{Fore.YELLOW}Aviso: Não foi possível enviar confirmação Telegram: {e}")
 
+    def _gravar_refresh(self, event, ts: str, time_since: float):
+        """Grava evento de refresh no banco e em logs/refresh_log.txt"""
+        self.session.log_refresh_event(
+            reason=event.reason,
+            time_since_last_explosion=time_since,
+            manual=event.manual,
+            success=event.success
+        )
+        if self._refresh_log_fh:
+            self._refresh_log_fh.write(f"{ts} | {event.reason} | manual={event.manual} | success={event.success}\n")
+            self._refresh_log_fh.flush()
+
     def load_config(self) -> Dict:
         """Carrega configuracao"""
         try:
@@ -627,45 +900,27 @@ class HybridSystemV2:
     def setup_refresh_callbacks(self):
         """Configura callbacks do refresh manager"""
         def on_refresh(event):
+            ts = event.timestamp.strftime("%Y-%m-%d %H:%M:%S")  # Formatado uma vez (log + Telegram)
             self._log(f"{Fore.YELLOW}Auto-refresh executado: {event.reason}")
-            # Salvar no banco de dados
-            try:
-                time_since = self.refresh_manager.get_time_since_last_explosion()
-                self.session.log_refresh_event(
-                    reason=event.reason,
-                    time_since_last_explosion=time_since,
-                    manual=event.manual,
-                    success=event.success
-                )
-                # Salvar também em arquivo de log
-                import os
-                os.makedirs("logs", exist_ok=True)
-                with open("logs/refresh_log.txt", "a", encoding="utf-8") as f:
-                    ts = event.timestamp.strftime("%Y-%m-%d %H:%M:%S")
-                    f.write(f"{ts} | {event.reason} | manual={event.manual} | success={event.success}\n")
-            except Exception as e:
-                self._log(f"{Fore.RED}Erro ao logar refresh: {e}")
+            # Salvar no banco de dados e no arquivo de log (na thread de auditoria)
+            time_since = self.refresh_manager.get_time_since_last_explosion()
+            self._audit_queue.put(lambda: self._gravar_refresh(event, ts, time_since))
 
             # Notificar via Telegram (se habilitado)
             if self._telegram_enabled():
                 try:
-                    import requests
-                    config_file = os.path.join(os.path.dirname(__file__), 'telegram_config.json')
-                    if os.path.exists(config_file):
-                        with open(config_file, 'r') as f:
-                            tg_config = json.load(f)
-                        token = tg_config.get('token')
-                        chat_id = tg_config.get('chat_id')
-                        if token and chat_id:
-                            hora = event.timestamp.strftime("%H:%M")
-                            msg = f"🔄 <b>REFRESH EXECUTADO</b>\n\n"
-                            msg += f"⏰ Horário: {hora}\n"
-                            msg += f"📋 Motivo: {event.reason}\n"
-                            msg += f"💰 Saldo: R$ {self.saldo_atual:.2f}\n"
-                            msg += f"✅ Sucesso: {'Sim' if event.success else 'Não'}"
-
-                            url = f"https://api.telegram.org/bot{token}/sendMessage"
-                            requests.post(url, data={'chat_id': chat_id, 'text': msg, 'parse_mode': 'HTML'}, timeout=5)
+                    tg_config = self._get_tg_config()
+                    token = tg_config.get('token')
+                    chat_id = tg_config.get('chat_id')
+                    if token and chat_id:
+                        hora = ts[11:16]  # HH:MM
+                        msg = f"🔄 <b>REFRESH EXECUTADO</b>\n\n"
+                        msg += f"⏰ Horário: {hora}\n"
+                        msg += f"📋 Motivo: {event.reason}\n"
+                        msg += f"💰 Saldo: R$ {self.saldo_atual:.2f}\n"
+                        msg += f"✅ Sucesso: {'Sim' if event.success else 'Não'}"
+
+                        self._tg_post(chat_id, msg)
                 except Exception as e:
                     self._log(f"{Fore.YELLOW}Aviso: Não foi possível enviar Telegram: {e}")
 
@@ -683,8 +938,7 @@ class HybridSystemV2:
         def check_balance_for_refresh():
             """Leitura de saldo APENAS para detectar página travada - NÃO atualiza saldo do sistema"""
             try:
-                profile_config = self.config.get('profiles', {}).get(self.selected_profile, {})
-                balance_area = profile_config.get('balance_area')
+                balance_area = self._profile_config.get('balance_area')
                 if balance_area:
                     return self.vision.get_balance(balance_area)
             except:
@@ -703,7 +957,13 @@ class HybridSystemV2:
             print(f"{Fore.RED}Nenhum perfil encontrado!")  # Erro critico
             exit(1)
 
-        # Menu de selecao sempre aparece
+        # Perfil unico: selecionar direto, sem menu
+        if len(profiles) == 1:
+            selected = profiles[0]
+            print(f"{Fore.GREEN}Perfil: {selected}")
+            self.configure_vision_areas(selected)
+            return selected
+
         print(f"{Fore.CYAN}SELECAO DE PERFIL")
         print(f"{Fore.WHITE}{'='*40}")
 
@@ -732,6 +992,7 @@ class HybridSystemV2:
     def configure_vision_areas(self, profile_name: str):
         """Configura areas de captura"""
         profile_data = self.config['profiles'][profile_name]
+        self._profile_config = profile_data  # Lido pelas threads de captura sem novo lookup
         areas = {}
 
         if 'multiplier_area' in profile_data:
@@ -744,8 +1005,7 @@ class HybridSystemV2:
     def capture_balance(self) -> Optional[float]:
         """Captura saldo da tela"""
         try:
-            profile_config = self.config.get('profiles', {}).get(self.selected_profile, {})
-            balance_area = profile_config.get('balance_area')
+            balance_area = self._profile_config.get('balance_area')
 
             if balance_area:
                 return self.vision.get_balance(balance_area)
@@ -756,48 +1016,42 @@ class HybridSystemV2:
 
     def capture_multipliers_continuously(self):
         """Thread de captura continua de multiplicadores"""
+        multiplier_area = self._profile_config.get('multiplier_area')  # Fixo durante a thread
         while self.running:
             try:
-                profile_config = self.config.get('profiles', {}).get(self.selected_profile, {})
-                multiplier_area = profile_config.get('multiplier_area')
-
                 if multiplier_area:
                     multiplier = self.vision.get_multiplier(multiplier_area)
 
                     if multiplier and multiplier > 0:
-                        with self.buffer_lock:
-                            self.frame_buffer.append({
-                                'timestamp': time.time(),
-                                'value': multiplier
-                            })
+                        if multiplier <= 500.0:
+                            self._latest_mult = (time.time(), multiplier)
+                        self.frame_ready.set()
 
-                time.sleep(0.05)
+                self._parar_event.wait(0.05)
 
             except Exception:
-                time.sleep(0.1)
+                self._parar_event.wait(0.1)
 
     def detect_bet_and_process(self):
         """Thread de deteccao de BET e processamento"""
+        bet_area = self._profile_config.get('bet_area')  # Fixo durante a thread
         while self.running:
             try:
-                profile_config = self.config.get('profiles', {}).get(self.selected_profile, {})
-                bet_area = profile_config.get('bet_area')
-
                 if not bet_area:
-                    time.sleep(0.1)
+                    self._parar_event.wait(0.1)
+                    continue
+
+                # Cooldown de 8 segundos: checado ANTES do OCR (relogio monotonico)
+                restante = 8.0 - (time.monotonic() - self.last_bet_detection_time)
+                if restante > 0:
+                    self._parar_event.wait(restante)
+                    self.frame_ready.clear()
                     continue
 
                 bet_detected = self.vision.detect_bet_text(bet_area)
 
                 if bet_detected:
-                    current_time = time.time()
-
-                    # Cooldown de 8 segundos
-                    if current_time - self.last_bet_detection_time < 8.0:
-                        time.sleep(0.1)
-                        continue
-
-                    self.last_bet_detection_time = current_time
+                    self.last_bet_detection_time = time.monotonic()
 
                     # Buscar valor da explosao
                     explosion_value = self.get_explosion_from_buffer()
@@ -807,30 +1061,23 @@ class HybridSystemV2:
                         self.process_explosion(explosion_value)
                         self.stats['capturas_ok'] += 1
 
-                        # Limpar buffer apos processar para evitar dados antigos
-                        with self.buffer_lock:
-                            self.frame_buffer.clear()
+                        # Descartar valor apos processar para evitar dados antigos
+                        self._latest_mult = None
                     else:
                         self.stats['capturas_erro'] += 1
 
-                time.sleep(0.05)
+                # Acorda com o proximo frame capturado (ou apos 100ms sem frames)
+                self.frame_ready.wait(timeout=0.1)
+                self.frame_ready.clear()
 
             except Exception as e:
                 self.stats['capturas_erro'] += 1
-                time.sleep(0.1)
+                self._parar_event.wait(0.1)
 
     def get_explosion_from_buffer(self) -> Optional[float]:
-        """Obtem valor da explosao do buffer - retorna o MAIS RECENTE"""
-        with self.buffer_lock:
-            buffer_copy = list(self.frame_buffer)
-
-        # Iterar do mais recente para o mais antigo
-        for frame in reversed(buffer_copy):
-            value = frame.get('value')
-            if value and 0 < value <= 500.0:
-                return value
-
-        return None
+        """Obtem valor da explosao - o MAIS RECENTE valido (0 < v <= 500)"""
+        latest = self._latest_mult
+        return latest[1] if latest else None
 
     def process_explosion(self, multiplicador: float):
         """
@@ -854,7 +1101,18 @@ class HybridSystemV2:
         self.regime_detector.adicionar_multiplicador(multiplicador)
 
         # Verificar comandos do Telegram
-        self.processar_comandos_telegram()
+        # Caminho rapido: baixo aguardando gatilho que nao completa o gatilho nesta
+        # rodada (nada a apostar) -> comandos ficam para a cadencia de 5 rodadas.
+        # Rodadas que podem disparar aposta sempre verificam.
+        martingale = self.martingale
+        rodada_rapida = (
+            multiplicador < martingale.THRESHOLD_BAIXO
+            and martingale.state == SessionState.AGUARDANDO_GATILHO
+            and martingale.sequencia_baixos + 1 < martingale.GATILHO
+            and self.total_rodadas % 5 != 0
+        )
+        if not rodada_rapida:
+            self.processar_comandos_telegram()
 
         # Atualizar refresh manager
         self.refresh_manager.update_explosion_time()
@@ -886,7 +1144,7 @@ class HybridSystemV2:
 
         # Verificar se slot 2 foi executado (importante para T5 com 2 slots)
         slot2_executado = True
-        if hasattr(self, 'last_bet_ids') and self.last_bet_ids:
+        if self.last_bet_ids:
             # Se tem slot 2 configurado, verificar se foi executado
             if 2 in self.last_bet_ids:
                 slot2_executado = self.last_bet_ids[2].get('executado', False)
@@ -898,8 +1156,9 @@ class HybridSystemV2:
         resultado = self.martingale.processar_multiplicador(multiplicador, slot2_executado)
 
         # ===== ATUALIZAR RESULTADO DA APOSTA NO BANCO (TODOS OS SLOTS) =====
-        if estava_em_martingale and hasattr(self, 'last_bet_ids') and self.last_bet_ids:
+        if estava_em_martingale and self.last_bet_ids:
             profit_loss_total = 0
+            resultados = []  # Gravados juntos: um commit para todos os slots
 
             for slot_id, slot_info in self.last_bet_ids.items():
                 if not slot_info.get('executado'):
@@ -918,28 +1177,29 @@ class HybridSystemV2:
 
                 profit_loss_total += profit_loss
 
-                # Atualizar no banco
-                self.session.update_bet_result(
-                    bet_id=bet_id,
-                    actual_multiplier=multiplicador,
-                    result="WIN" if ganhou else "LOSS",
-                    profit_loss=profit_loss,
-                    working_balance_after=self.saldo_atual + profit_loss_total
-                )
+                resultados.append((
+                    bet_id, multiplicador, "WIN" if ganhou else "LOSS",
+                    profit_loss, self.saldo_atual + profit_loss_total
+                ))
 
                 print(f"{Fore.CYAN}[DB] Slot {slot_id}: {('WIN' if ganhou else 'LOSS')} | P/L: R$ {profit_loss:+.2f}")
 
+            # Atualizar no banco
+            if resultados:
+                self.session.update_bet_results(resultados)
+
             # Limpar após processar
             self.last_bet_ids = {}
 
-        # Log do estado atual
-        estado_str = f"[{self.martingale.state.value}]"
-        if self.martingale.state == SessionState.AGUARDANDO_GATILHO:
-            estado_str += f" Baixos: {self.martingale.sequencia_baixos}/{self.martingale.GATILHO}"
-        elif self.martingale.state == SessionState.EM_MARTINGALE:
-            estado_str += f" T{self.martingale.tentativa_atual}/{self.martingale.MAX_TENTATIVAS}"
+        # Log do estado atual (montado so quando vai ser exibido)
+        if not self.silent_mode:
+            estado_str = f"[{self.martingale.state.value}]"
+            if self.martingale.state == SessionState.AGUARDANDO_GATILHO:
+                estado_str += f" Baixos: {self.martingale.sequencia_baixos}/{self.martingale.GATILHO}"
+            elif self.martingale.state == SessionState.EM_MARTINGALE:
+                estado_str += f" T{self.martingale.tentativa_atual}/{self.martingale.MAX_TENTATIVAS}"
 
-        self._log(f"{Fore.CYAN}Explosao: {multiplicador:.2f}x {estado_str}")
+            self._log(f"{Fore.CYAN}Explosao: {multiplicador:.2f}x {estado_str}")
 
         # ===== LER SALDO SE NECESSARIO (INICIO) =====
         if resultado.get('precisa_ler_saldo_inicio'):
@@ -972,7 +1232,7 @@ class HybridSystemV2:
                 self.saldo_atual = saldo
 
                 # NS7_PURO, G6_NS9, G6_NS10: usar 100% do saldo (sem reserva)
-                if self.config_modo.modo in [ModoOperacao.NS7_PURO, ModoOperacao.G6_NS9, ModoOperacao.G6_NS10]:
+                if self._modo_sem_reserva:
                     reserva = 0.0
                     banca_operacional = saldo
                     self.martingale.definir_saldo_inicio(banca_operacional)
@@ -998,7 +1258,7 @@ class HybridSystemV2:
                     self._log(f"{Fore.GREEN}Aposta base calculada: R$ {self.martingale.aposta_base:.2f} ({NIVEIS_SEGURANCA[self.martingale.nivel_seguranca]['nome']})")
 
                 # AUDITORIA: Inicio do gatilho
-                self._audit('GATILHO_INICIO', {
+                self._audit('GATILHO_INICIO', lambda: {
                     'saldo_total': saldo,
                     'reserva': reserva,
                     'banca_operacional': banca_operacional,
@@ -1020,41 +1280,13 @@ class HybridSystemV2:
             self.executar_aposta()
 
         elif resultado['acao'] == 'finalizar':
-            # ===== LER SALDO (FIM) =====
-            if resultado.get('precisa_ler_saldo_fim'):
-                saldo = self.capture_balance()
-                if saldo and saldo > 0:
-                    self.saldo_atual = saldo
-                    # CORRECAO: usar banca operacional (saldo - reserva) para P/L correto
-                    banca_op_fim = saldo - self.reserva_manager.get_reserva()
-                    self.martingale.definir_saldo_fim(banca_op_fim)
-
-            # Som de WIN se ganhou
-            if resultado.get('resultado_sessao') == 'win':
-                self._som_win()
-
-            # Registrar resultado
-            self.registrar_resultado_sessao(resultado)
-
-            # Resetar para proxima sessao
-            self.martingale.reset()
+            self._encerrar_sessao(resultado)
 
         elif resultado['acao'] == 'parar':
             # ===== CENARIO B: PARAR VOLUNTARIAMENTE =====
             # T5 com cenário B - só slot de segurança ganhou, aceitar perda parcial
-            if resultado.get('precisa_ler_saldo_fim'):
-                saldo = self.capture_balance()
-                if saldo and saldo > 0:
-                    self.saldo_atual = saldo
-                    # CORRECAO: usar banca operacional (saldo - reserva) para P/L correto
-                    banca_op_fim = saldo - self.reserva_manager.get_reserva()
-                    self.martingale.definir_saldo_fim(banca_op_fim)
-
-            # Registrar como loss (perda parcial)
-            self.registrar_resultado_sessao(resultado)
-
-            # Resetar para proxima sessao
-            self.martingale.reset()
+            # (registrado como loss - perda parcial)
+            self._encerrar_sessao(resultado)
 
             self._log(f"{Fore.YELLOW}CENARIO B: Parando para evitar perda maior!")
 
@@ -1079,6 +1311,27 @@ class HybridSystemV2:
                 self.saldo_atual = saldo
             self.salvar_estado()
 
+    def _encerrar_sessao(self, resultado: Dict):
+        """Fim de sessao ('finalizar' ou 'parar'): le saldo, registra resultado e reseta"""
+        # ===== LER SALDO (FIM) =====
+        if resultado.get('precisa_ler_saldo_fim'):
+            saldo = self.capture_balance()
+            if saldo and saldo > 0:
+                self.saldo_atual = saldo
+                # CORRECAO: usar banca operacional (saldo - reserva) para P/L correto
+                banca_op_fim = saldo - self.reserva_manager.get_reserva()
+                self.martingale.definir_saldo_fim(banca_op_fim)
+
+        # Som de WIN se ganhou
+        if resultado.get('resultado_sessao') == 'win':
+            self._som_win()
+
+        # Registrar resultado
+        self.registrar_resultado_sessao(resultado)
+
+        # Resetar para proxima sessao
+        self.martingale.reset()
+
     def executar_aposta(self):
         """
         Executa a aposta da tentativa atual (V4 - suporta 2 slots).
@@ -1216,13 +1469,16 @@ class HybridSystemV2:
 
             if resultado_reserva:
                 # Bateu meta de 10%!
-                self._log(f"\n{Fore.MAGENTA}{'='*50}")
-                self._log(f"{Fore.MAGENTA}  META 10% BATIDA!")
-                self._log(f"{Fore.MAGENTA}  Reserva: +R$ {resultado_reserva['valor_reserva']:.2f}")
-                self._log(f"{Fore.MAGENTA}  Compound: +R$ {resultado_reserva['valor_compound']:.2f}")
-                self._log(f"{Fore.MAGENTA}  Total reservado: R$ {resultado_reserva['reserva_total']:.2f}")
-                self._log(f"{Fore.MAGENTA}  Nova banca base: R$ {resultado_reserva['nova_banca_base']:.2f}")
-                self._log(f"{Fore.MAGENTA}{'='*50}\n")
+                m = Fore.MAGENTA
+                self._log(
+                    f"\n{m}{SEPARADOR}\n"
+                    f"{m}  META 10% BATIDA!\n"
+                    f"{m}  Reserva: +R$ {resultado_reserva['valor_reserva']:.2f}\n"
+                    f"{m}  Compound: +R$ {resultado_reserva['valor_compound']:.2f}\n"
+                    f"{m}  Total reservado: R$ {resultado_reserva['reserva_total']:.2f}\n"
+                    f"{m}  Nova banca base: R$ {resultado_reserva['nova_banca_base']:.2f}\n"
+                    f"{m}{SEPARADOR}\n"
+                )
 
             # ===== PAGAMENTO DE DIVIDA (PRIORIDADE) =====
             if self.reserva_manager.tem_divida() and resumo['lucro_perda'] > 0:
@@ -1258,49 +1514,54 @@ class HybridSystemV2:
             )
 
             if resultado_emprestimo:
-                self._log(f"\n{Fore.CYAN}{'='*50}")
-                self._log(f"{Fore.CYAN}  EMPRESTIMO DA RESERVA!")
-                self._log(f"{Fore.CYAN}  Valor: R$ {resultado_emprestimo['valor_emprestado']:.2f}")
-                self._log(f"{Fore.CYAN}  Reserva restante: R$ {resultado_emprestimo['reserva_restante']:.2f}")
-                self._log(f"{Fore.CYAN}  Divida total: R$ {resultado_emprestimo['divida_total']:.2f}")
-                self._log(f"{Fore.CYAN}{'='*50}\n")
+                c = Fore.CYAN
+                self._log(
+                    f"\n{c}{SEPARADOR}\n"
+                    f"{c}  EMPRESTIMO DA RESERVA!\n"
+                    f"{c}  Valor: R$ {resultado_emprestimo['valor_emprestado']:.2f}\n"
+                    f"{c}  Reserva restante: R$ {resultado_emprestimo['reserva_restante']:.2f}\n"
+                    f"{c}  Divida total: R$ {resultado_emprestimo['divida_total']:.2f}\n"
+                    f"{c}{SEPARADOR}\n"
+                )
                 # Resetar contador de gatilhos para evitar emprestimo imediato
                 self.aceleracao_manager.estado.gatilhos_desde_t6 = 0
                 self.aceleracao_manager.salvar()
 
         # ===== AUDITORIA: Fim do gatilho =====
-        reserva_atual = self.reserva_manager.get_reserva()
-        banca_op_final = self.saldo_atual - reserva_atual
-        audit_pagamento = 0
-        audit_emprestimo = 0
-        try:
-            if resultado_pagamento:
-                audit_pagamento = resultado_pagamento.get('pagamento', 0)
-        except:
-            pass
-        try:
-            if resultado_emprestimo:
-                audit_emprestimo = resultado_emprestimo.get('valor_emprestado', 0)
-        except:
-            pass
-        self._audit('GATILHO_FIM', {
-            'resultado': emoji,
-            'tentativa_final': tentativa_final,
-            'cenario': cenario.value if cenario else None,
-            'lucro_perda': resumo['lucro_perda'],
-            'saldo_total': self.saldo_atual,
-            'reserva': reserva_atual,
-            'banca_operacional': banca_op_final,
-            'divida': self.reserva_manager.estado.divida_reserva,
-            'aposta_base_ns6': banca_op_final / 63,
-            'aposta_base_ns7': banca_op_final / 127,
-            'meta_batida': resultado_reserva is not None,
-            'valor_reserva_add': resultado_reserva['valor_reserva'] if resultado_reserva else 0,
-            'pagamento_divida': audit_pagamento,
-            'emprestimo': audit_emprestimo,
-            'gatilhos_desde_t6': self.aceleracao_manager.estado.gatilhos_desde_t6,
-            'padrao_posicao': self.aceleracao_manager.get_posicao_padrao()
-        })
+        def _dados_gatilho_fim():
+            reserva_atual = self.reserva_manager.get_reserva()
+            banca_op_final = self.saldo_atual - reserva_atual
+            audit_pagamento = 0
+            audit_emprestimo = 0
+            try:
+                if resultado_pagamento:
+                    audit_pagamento = resultado_pagamento.get('pagamento', 0)
+            except:
+                pass
+            try:
+                if resultado_emprestimo:
+                    audit_emprestimo = resultado_emprestimo.get('valor_emprestado', 0)
+            except:
+                pass
+            return {
+                'resultado': emoji,
+                'tentativa_final': tentativa_final,
+                'cenario': cenario.value if cenario else None,
+                'lucro_perda': resumo['lucro_perda'],
+                'saldo_total': self.saldo_atual,
+                'reserva': reserva_atual,
+                'banca_operacional': banca_op_final,
+                'divida': self.reserva_manager.estado.divida_reserva,
+                'aposta_base_ns6': banca_op_final / 63,
+                'aposta_base_ns7': banca_op_final / 127,
+                'meta_batida': resultado_reserva is not None,
+                'valor_reserva_add': resultado_reserva['valor_reserva'] if resultado_reserva else 0,
+                'pagamento_divida': audit_pagamento,
+                'emprestimo': audit_emprestimo,
+                'gatilhos_desde_t6': self.aceleracao_manager.estado.gatilhos_desde_t6,
+                'padrao_posicao': self.aceleracao_manager.get_posicao_padrao()
+            }
+        self._audit('GATILHO_FIM', _dados_gatilho_fim)
 
         # ===== REGISTRAR TRIGGER NO RALLY DETECTOR =====
         self.rally_detector.registrar_trigger()
@@ -1331,6 +1592,8 @@ class HybridSystemV2:
                 self.estatisticas_validacao.registrar_zerou()
 
         # Registrar cada tentativa no historico de apostas
+        # (no maximo MAX_TENTATIVAS itens: laco simples, sem arrays NumPy)
+        gatilho_mults = list(self.martingale.multiplicadores_gatilho)  # Igual para toda a sessao
         for tentativa in self.martingale.tentativas:
             # Usar propriedade resultado que considera cenario
             ganhou = tentativa.resultado == "WIN"
@@ -1343,17 +1606,13 @@ class HybridSystemV2:
                 ganho_slot1 = (tentativa.valor_slot1 * (tentativa.alvo_slot1 - 1)) if mult >= tentativa.alvo_slot1 else -tentativa.valor_slot1
                 ganho_slot2 = (tentativa.valor_slot2 * (tentativa.alvo_slot2 - 1)) if mult >= tentativa.alvo_slot2 else -tentativa.valor_slot2
                 resultado_financeiro = ganho_slot1 + ganho_slot2
+                alvo_display = f"{tentativa.alvo_slot1}/{tentativa.alvo_slot2}"
             else:
                 # 1 slot: calculo simples
                 if ganhou:
                     resultado_financeiro = tentativa.valor_slot1 * tentativa.alvo_slot1 - tentativa.valor_slot1
                 else:
                     resultado_financeiro = -tentativa.valor_slot1
-
-            # Determinar alvo para exibicao
-            if tentativa.is_2_slots:
-                alvo_display = f"{tentativa.alvo_slot1}/{tentativa.alvo_slot2}"
-            else:
                 alvo_display = tentativa.alvo_slot1
 
             aposta_registro = {
@@ -1369,20 +1628,18 @@ class HybridSystemV2:
 
             # Adicionar multiplicadores do gatilho na T1 ou quando há perda (para auditoria)
             if tentativa.numero == 1 or not ganhou:
-                aposta_registro['gatilho_mults'] = list(self.martingale.multiplicadores_gatilho)
-                aposta_registro['gatilho_count'] = len(self.martingale.multiplicadores_gatilho)
+                aposta_registro['gatilho_mults'] = gatilho_mults
+                aposta_registro['gatilho_count'] = len(gatilho_mults)
 
             self.historico_apostas.append(aposta_registro)
 
-        # Limitar histórico de apostas para evitar memory leak
-        if len(self.historico_apostas) > 500:
-            self.historico_apostas = self.historico_apostas[-250:]
-
         # Mostrar cenario na saida
         cenario_str = f" [{cenario.value}]" if cenario else ""
-        self._log(f"\n{cor}{'='*50}")
-        self._log(f"{cor}  SESSAO {emoji}{cenario_str} | T{len(self.martingale.tentativas)} | P/L: R$ {resumo['lucro_perda']:+.2f}")
-        self._log(f"{cor}{'='*50}\n")
+        self._log(
+            f"\n{cor}{SEPARADOR}\n"
+            f"{cor}  SESSAO {emoji}{cenario_str} | T{len(self.martingale.tentativas)} | P/L: R$ {resumo['lucro_perda']:+.2f}\n"
+            f"{cor}{SEPARADOR}\n"
+        )
 
         # Registrar no banco de dados
         self.session.save_recommendation(
@@ -1399,8 +1656,7 @@ class HybridSystemV2:
 
         # ===== VERIFICAR UPGRADE AUTOMATICO DE NIVEL =====
         # Funciona para AUTOMATICO, G6_NS9 e G6_NS10
-        modos_com_upgrade = [ModoOperacao.AUTOMATICO, ModoOperacao.G6_NS9, ModoOperacao.G6_NS10]
-        if self.config_modo.modo in modos_com_upgrade:
+        if self._modo_com_upgrade:
             self.verificar_upgrade_nivel()
 
         # ===== AUTO-SAVE APOS CADA SESSAO =====
@@ -1458,8 +1714,12 @@ class HybridSystemV2:
         self.salvar_estado()
         return True
 
-    def salvar_estado(self):
-        """Salva o estado atual da sessao para persistencia"""
+    def salvar_estado(self, force: bool = False):
+        """
+        Salva o estado atual da sessao para persistencia.
+        Por padrao agenda a gravacao (debounce de 500ms na thread _estado_writer);
+        force=True grava agora, descartando o que estiver pendente.
+        """
         estado = EstadoSessao(
             sessao_id=self.sessao_id,
             inicio_timestamp=self.session_start.strftime('%Y-%m-%d %H:%M:%S'),
@@ -1473,9 +1733,30 @@ class HybridSystemV2:
             sessoes_loss=self.stats['sessoes_loss'],
             total_rodadas=self.total_rodadas,
             perfil_ativo=self.selected_profile,
-            historico_apostas=self.historico_apostas,
+            historico_apostas=list(self.historico_apostas),  # Copia: gravado em outra thread
         )
-        salvar_estado_sessao(estado)
+        with self._estado_lock:
+            if force:
+                self._estado_pendente = None
+                salvar_estado_sessao(estado)
+                return
+            self._estado_pendente = estado
+        self._estado_event.set()
+
+    def _estado_writer(self):
+        """Thread de estado: espera a rajada de salvar_estado acabar e grava so o ultimo"""
+        while True:
+            self._estado_event.wait()
+            time.sleep(0.5)
+            self._estado_event.clear()
+            self._estado_flush()
+
+    def _estado_flush(self):
+        """Grava o estado pendente, se houver (thread de estado, stop e atexit)"""
+        with self._estado_lock:
+            estado, self._estado_pendente = self._estado_pendente, None
+            if estado is not None:
+                salvar_estado_sessao(estado)
 
     def registrar_saque(self, valor: float):
         """Registra um saque e salva o estado"""
@@ -1490,8 +1771,8 @@ class HybridSystemV2:
         print(f"{Fore.WHITE}  Novo saldo: R$ {self.saldo_atual:.2f}")
         print(f"{Fore.WHITE}  Total sacado: R$ {self.total_saques:.2f}")
 
-        # Salvar estado apos saque
-        self.salvar_estado()
+        # Salvar estado apos saque (na hora: nao pode se perder num crash)
+        self.salvar_estado(force=True)
 
     def restaurar_estado(self):
         """Restaura o estado da sessao anterior"""
@@ -1526,7 +1807,7 @@ class HybridSystemV2:
 
         # Restaurar historico de apostas (importante para o grafico!)
         if hasattr(self.estado_anterior, 'historico_apostas') and self.estado_anterior.historico_apostas:
-            self.historico_apostas = self.estado_anterior.historico_apostas
+            self.historico_apostas = deque(self.estado_anterior.historico_apostas, maxlen=500)
             self._log(f"{Fore.WHITE}  Historico: {len(self.historico_apostas)} apostas restauradas")
 
         # NAO restaurar config_modo - usar o que veio do start_v2.py
@@ -1543,7 +1824,12 @@ class HybridSystemV2:
     def processar_comandos_telegram(self):
         """Verifica e executa comandos enviados pelo Telegram"""
         try:
-            if not os.path.exists(TELEGRAM_COMMANDS_FILE):
+            # Chamado a cada rodada: um stat() e retorna se nada mudou desde a ultima leitura
+            try:
+                mtime = os.stat(TELEGRAM_COMMANDS_FILE).st_mtime_ns
+            except FileNotFoundError:
+                return
+            if mtime == self._tg_cmds_mtime:
                 return
 
             with open(TELEGRAM_COMMANDS_FILE, 'r') as f:
@@ -1582,6 +1868,8 @@ class HybridSystemV2:
             if modified:
                 with open(TELEGRAM_COMMANDS_FILE, 'w') as f:
                     json.dump(commands, f, indent=2)
+                mtime = os.stat(TELEGRAM_COMMANDS_FILE).st_mtime_ns
+            self._tg_cmds_mtime = mtime
 
         except Exception as e:
             pass  # Silencioso para nao atrapalhar o bot
@@ -1589,33 +1877,33 @@ class HybridSystemV2:
     # ===== REDEFINIR SESSÃO (RESET PARCIAL) =====
 
     def _detectar_machine_id(self) -> str:
-        """Detecta o ID da máquina atual para o dashboard."""
+        """Detecta o ID da máquina atual para o dashboard (nao muda durante o processo)."""
+        if self._machine_id is None:
+            self._machine_id = self._ler_machine_id()
+        return self._machine_id
+
+    def _ler_machine_id(self) -> str:
+        """Le o ID da máquina: sync_client.py, machine_config.json ou sistema operacional."""
         import platform
 
         # 1. Tentar ler de sync_client.py (mais confiável para Windows)
         try:
             sync_client_path = os.path.join(os.path.dirname(__file__), 'sync_client.py')
-            if os.path.exists(sync_client_path):
-                with open(sync_client_path, 'r') as f:
-                    content = f.read()
-                    import re
-                    match = re.search(r'MACHINE_ID\s*=\s*["\'](\w+)["\']', content)
-                    if match:
-                        return match.group(1).lower()
+            with open(sync_client_path, 'r') as f:
+                content = f.read()
+                match = MACHINE_ID_RE.search(content)
+                if match:
+                    return match.group(1).lower()
         except:
             pass
 
         # 2. Tentar ler de machine_config.json
         try:
-            config_path = os.path.join(os.path.dirname(__file__), 'machine_config.json')
-            if os.path.exists(config_path):
-                with open(config_path, 'r') as f:
-                    config = json.load(f)
-                    name = config.get('machine_name', '').lower()
-                    if 'isolada' in name:
-                        return 'isolada'
-                    elif 'dual' in name or 'conservadora' in name:
-                        return 'conservadora'
+            name = self._machine_config.get('machine_name', '').lower()
+            if 'isolada' in name:
+                return 'isolada'
+            elif 'dual' in name or 'conservadora' in name:
+                return 'conservadora'
         except:
             pass
 
@@ -1694,12 +1982,14 @@ class HybridSystemV2:
                 novo_modo = novo_modo.lower()
                 if novo_modo == 'ns9':
                     self.config_modo.modo = ModoOperacao.G6_NS9
+                    self._atualizar_flags_modo()
                     self.nivel_seguranca = 9
                     if hasattr(self, 'martingale'):
                         self.martingale.set_nivel_seguranca(9)
                     self._log(f"{Fore.GREEN}  Modo alterado para NS9 (Agressivo)")
                 elif novo_modo == 'ns10':
                     self.config_modo.modo = ModoOperacao.G6_NS10
+                    self._atualizar_flags_modo()
                     self.nivel_seguranca = 10
                     if hasattr(self, 'martingale'):
                         self.martingale.set_nivel_seguranca(10)
@@ -1723,7 +2013,7 @@ class HybridSystemV2:
 
     def _verificar_auto_restart(self, multiplicador: float):
         """Verifica se deve fazer auto-restart para liberar memória"""
-        tempo_rodando = time.time() - self.auto_restart_timestamp
+        tempo_rodando = time.monotonic() - self.auto_restart_timestamp
 
         # Se ainda não passou o intervalo, não faz nada
         if tempo_rodando < AUTO_RESTART_INTERVAL:
@@ -1775,7 +2065,7 @@ class HybridSystemV2:
         self._log(f"{Fore.GREEN}{'='*60}\n")
 
         # 1. Salvar estado atual
-        self._salvar_estado_sessao()
+        self.salvar_estado(force=True)
         self._log(f"{Fore.GREEN}  [OK] Estado salvo")
 
         # 2. Criar flag de auto-restart
@@ -1806,23 +2096,19 @@ class HybridSystemV2:
         if not self._telegram_enabled():
             return
         try:
-            import requests
-            config_file = os.path.join(os.path.dirname(__file__), 'telegram_config.json')
-            if os.path.exists(config_file):
-                with open(config_file, 'r') as f:
-                    tg_config = json.load(f)
-                token = tg_config.get('token')
-                chat_id = tg_config.get('chat_id')
-                if token and chat_id:
-                    tempo_rodando = (time.time() - self.auto_restart_timestamp) / 3600
-                    msg = f"🔄 <b>AUTO-RESTART</b>\n\n"
-                    msg += f"Tempo rodando: {tempo_rodando:.1f}h\n"
-                    msg += f"Saldo: R$ {self.saldo_atual:.2f}\n"
-                    msg += f"Rodadas: {self.total_rodadas}\n\n"
-                    msg += f"Reiniciando para liberar memória..."
-
-                    url = f"https://api.telegram.org/bot{token}/sendMessage"
-                    requests.post(url, data={'chat_id': chat_id, 'text': msg, 'parse_mode': 'HTML'}, timeout=5)
+            tg_config = self._get_tg_config()
+            token = tg_config.get('token')
+            chat_id = tg_config.get('chat_id')
+            if token and chat_id:
+                tempo_rodando = (time.monotonic() - self.auto_restart_timestamp) / 3600
+                msg = f"🔄 <b>AUTO-RESTART</b>\n\n"
+                msg += f"Tempo rodando: {tempo_rodando:.1f}h\n"
+                msg += f"Saldo: R$ {self.saldo_atual:.2f}\n"
+                msg += f"Rodadas: {self.total_rodadas}\n\n"
+                msg += f"Reiniciando para liberar memória..."
+
+                # Sincrono: o processo encerra logo em seguida
+                self._tg_enviar(self._tg_url, chat_id, msg)
         except:
             pass
 
@@ -1831,30 +2117,25 @@ class HybridSystemV2:
         if not self._telegram_enabled():
             return
         try:
-            import requests
-            config_file = os.path.join(os.path.dirname(__file__), 'telegram_config.json')
-            if os.path.exists(config_file):
-                with open(config_file, 'r') as f:
-                    tg_config = json.load(f)
-                token = tg_config.get('token')
-                chat_id = tg_config.get('chat_id')
-                if token and chat_id:
-                    mults_str = ", ".join([f"{m:.2f}" for m in multiplicadores])
-                    msg = f"🚨🚨🚨 <b>BUG DETECTADO!</b> 🚨🚨🚨\n\n"
-                    msg += f"<b>Gatilho disparou com {qtd_mults} baixos!</b>\n"
-                    msg += f"Esperado: 6\n\n"
-                    msg += f"<b>Multiplicadores:</b>\n{mults_str}\n\n"
-                    msg += f"Horário: {horario_brasilia()}\n"
-                    msg += f"Saldo: R$ {self.saldo_atual:.2f}"
-
-                    url = f"https://api.telegram.org/bot{token}/sendMessage"
-                    requests.post(url, data={'chat_id': chat_id, 'text': msg, 'parse_mode': 'HTML'}, timeout=5)
-
-                    # Log local também
-                    print(f"\n{Fore.RED}{'='*60}")
-                    print(f"{Fore.RED}  BUG! GATILHO COM {qtd_mults} BAIXOS (esperado 6)")
-                    print(f"{Fore.RED}  Mults: {mults_str}")
-                    print(f"{Fore.RED}{'='*60}\n")
+            tg_config = self._get_tg_config()
+            token = tg_config.get('token')
+            chat_id = tg_config.get('chat_id')
+            if token and chat_id:
+                mults_str = ", ".join([f"{m:.2f}" for m in multiplicadores])
+                msg = f"🚨🚨🚨 <b>BUG DETECTADO!</b> 🚨🚨🚨\n\n"
+                msg += f"<b>Gatilho disparou com {qtd_mults} baixos!</b>\n"
+                msg += f"Esperado: 6\n\n"
+                msg += f"<b>Multiplicadores:</b>\n{mults_str}\n\n"
+                msg += f"Horário: {horario_brasilia()}\n"
+                msg += f"Saldo: R$ {self.saldo_atual:.2f}"
+
+                self._tg_post(chat_id, msg)
+
+                # Log local também
+                print(f"\n{Fore.RED}{'='*60}")
+                print(f"{Fore.RED}  BUG! GATILHO COM {qtd_mults} BAIXOS (esperado 6)")
+                print(f"{Fore.RED}  Mults: {mults_str}")
+                print(f"{Fore.RED}{'='*60}\n")
         except Exception as e:
             print(f"{Fore.RED}Erro ao enviar alerta Telegram: {e}")
 
@@ -1887,18 +2168,16 @@ class HybridSystemV2:
         # Status do refresh manager
         refresh_status = self.refresh_manager.get_status() if hasattr(self, 'refresh_manager') else {}
 
+        historico = self.multiplier_history.recent()
+
         # Contar sequencias >= 11
-        sequencias_longas = sum(1 for m in self.multiplier_history if m >= 11.0)
+        sequencias_longas = int(np.count_nonzero(historico >= 11.0))
 
         # Maior sequencia de baixos (estimativa baseada no historico)
-        maior_seq = 0
-        seq_atual = 0
-        for m in self.multiplier_history:
-            if m < 2.0:
-                seq_atual += 1
-                maior_seq = max(maior_seq, seq_atual)
-            else:
-                seq_atual = 0
+        # Bordas das corridas de < 2.0: +1 = inicio, -1 = fim
+        bordas = np.diff(np.concatenate(([0], (historico < 2.0).view(np.int8), [0])))
+        inicios = np.flatnonzero(bordas == 1)
+        maior_seq = int((np.flatnonzero(bordas == -1) - inicios).max()) if inicios.size else 0
 
         return {
             'running': self.running,
@@ -1917,15 +2196,15 @@ class HybridSystemV2:
             # Mostra aposta base real se em martingale, senao mostra projecao
             # CORRECAO: usar banca_operacional (saldo - reserva), nao saldo total
             'aposta_base': resumo['aposta_base'] if resumo['aposta_base'] > 0 else (
-                ((self.saldo_atual - self.reserva_manager.get_reserva()) * self.martingale.PCT_RISCO) / sum(self.martingale.MULTIPLICADORES_APOSTA)
+                ((self.saldo_atual - self.reserva_manager.get_reserva()) * self.martingale.PCT_RISCO) / self.martingale.SOMA_MULTIPLICADORES
                 if self.saldo_atual > 0 else 0.0
             ),
             'sessoes_win': self.stats['sessoes_win'],
             'sessoes_loss': self.stats['sessoes_loss'],
             'lucro_total': self.stats['lucro_total'],
-            'multiplier_history': list(self.multiplier_history)[-14:],
+            'multiplier_history': historico[-14:].tolist(),
             # Campos adicionais para interface
-            'historico_apostas': getattr(self, 'historico_apostas', []),
+            'historico_apostas': list(self.historico_apostas),  # UIs fatiam a lista
             'taxa_acerto': taxa_acerto,
             'sequencias_11_mais': sequencias_longas,
             'stats': {
@@ -1943,7 +2222,7 @@ class HybridSystemV2:
             'nivel_seguranca': self.martingale.nivel_seguranca,
             'nome_nivel': self.martingale.NOME_NIVEL,
             'modo_operacao': self.config_modo.modo.value,
-            'lucro_para_subir': self.config_modo.lucro_para_subir if self.config_modo.modo in [ModoOperacao.AUTOMATICO, ModoOperacao.G6_NS9, ModoOperacao.G6_NS10] else None,
+            'lucro_para_subir': self.config_modo.lucro_para_subir if self._modo_com_upgrade else None,
             'nivel_maximo_permitido': get_nivel_para_banca(self.saldo_atual),
             'total_saques': getattr(self, 'total_saques', 0.0),
             # Validacao estatistica
@@ -1983,6 +2262,7 @@ class HybridSystemV2:
             return
 
         self.running = True
+        self._parar_event.clear()
 
         # Thread de captura
         capture_thread = threading.Thread(target=self.capture_multipliers_continuously, daemon=True)
@@ -2021,6 +2301,8 @@ class HybridSystemV2:
         """Para sistema"""
         self._log(f"\n{Fore.YELLOW}Parando sistema...")
         self.running = False
+        self._parar_event.set()
+        self.frame_ready.set()  # Libera a thread de deteccao
 
         if hasattr(self, 'refresh_manager'):
             self.refresh_manager.stop_monitoring()
@@ -2031,6 +2313,8 @@ class HybridSystemV2:
         if hasattr(self, 'session'):
             self.session.close_session()
 
+        self._estado_flush()  # Grava estado ainda no debounce
+
         self.print_final_report()
 
     def print_final_report(self):
@@ -2060,5 +2344,11 @@ class HybridSystemV2:
 
 # Ponto de entrada
 if __name__ == "__main__":
-    system = HybridSystemV2()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Hybrid System V2")
+    parser.add_argument('--profile', help="Perfil de maquina (pula o menu de selecao)")
+    args = parser.parse_args()
+
+    system = HybridSystemV2(selected_profile=args.profile)
     system.start()
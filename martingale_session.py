@@ -35,6 +35,13 @@ from enum import Enum
 import json
 import os
 
+# orjson (opcional) para gravar session_state.json mais rapido
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 # ============================================================
 # CENARIOS DE RESULTADO (V4)
@@ -223,11 +230,22 @@ def get_session_state_path() -> str:
     return os.path.join(os.path.dirname(__file__), SESSION_STATE_FILE)
 
 
+def _estado_para_json(dados: Dict) -> bytes:
+    """Serializa o estado como JSON compacto em UTF-8 (orjson se disponivel)"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(dados, option=orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            pass  # Tipo nao suportado pelo orjson: usar json
+    return json.dumps(dados, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
 def salvar_estado_sessao(estado: EstadoSessao):
     """Salva o estado da sessao em arquivo"""
     try:
-        with open(get_session_state_path(), 'w', encoding='utf-8') as f:
-            json.dump(estado.to_dict(), f, indent=2, ensure_ascii=False)
+        dados = _estado_para_json(estado.to_dict())
+        with open(get_session_state_path(), 'wb') as f:
+            f.write(dados)
     except Exception as e:
         print(f"ERRO ao salvar estado: {e}")
 
@@ -326,6 +344,10 @@ NIVEL_GAGO = {
     'lucro_por_win': 14.14,  # ~14% por win (base * 0.99)
 }
 
+# Soma da progressao de cada nivel (fixa): calculada uma vez, nao a cada status
+for _cfg in (*NIVEIS_SEGURANCA.values(), NIVEL_GAGO):
+    _cfg['soma_multiplicadores'] = sum(_cfg['multiplicadores'])
+
 def get_config_tentativa_gago(tentativa: int) -> TentativaConfig:
     """
     Retorna configuracao da tentativa para estrategia GAGO.
@@ -680,6 +702,12 @@ class MartingaleSession:
             return NIVEL_GAGO['multiplicadores']
         return NIVEIS_SEGURANCA[self.nivel_seguranca]['multiplicadores']
 
+    @property
+    def SOMA_MULTIPLICADORES(self) -> int:
+        if self.modo_gago:
+            return NIVEL_GAGO['soma_multiplicadores']
+        return NIVEIS_SEGURANCA[self.nivel_seguranca]['soma_multiplicadores']
+
     @property
     def NOME_NIVEL(self) -> str:
         if self.modo_gago:
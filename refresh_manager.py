@@ -43,14 +43,15 @@ class RefreshManager:
         self.black_screen_timeout = 15   # 15 segundos de tela preta ou sem atividade
         self.stuck_multiplier_timeout = 15  # 15 segundos com multiplicador realmente travado
         self.monitoring_enabled = False
-        self.last_explosion_time = datetime.now()
+        # Marcas *_time usam time.monotonic(): so servem para medir intervalos
+        self.last_explosion_time = time.monotonic()
 
         # Configuração do navegador (firefox ou chrome)
         self.browser = browser.lower()
 
         # Restart Browser preventivo (RAM) - a cada 6 horas
         self.preventive_restart_interval = 6 * 60 * 60  # 6 horas
-        self.last_restart_time = datetime.now()
+        self.last_restart_time = time.monotonic()
         self.preventive_restart_pending = False
 
         # URL do jogo para restart
@@ -81,8 +82,8 @@ class RefreshManager:
 
         # Detecção de anomalias visuais
         self.last_multiplier_value = None
-        self.last_multiplier_change_time = datetime.now()
-        self.last_activity_time = datetime.now()
+        self.last_multiplier_change_time = time.monotonic()
+        self.last_activity_time = time.monotonic()
         self.black_screen_start_time = None
         self.multiplier_update_count = 0
 
@@ -91,7 +92,7 @@ class RefreshManager:
         self.balance_check_interval = 5
         self.balance_fail_count = 0
         self.balance_fail_threshold = 3
-        self.last_balance_check_time = datetime.now()
+        self.last_balance_check_time = time.monotonic()
 
         print(f"{Fore.GREEN}🔄 Refresh Manager inicializado")
         print(f"{Fore.CYAN}⏰ Timeout explosões: {self.auto_refresh_timeout}s | Timeout saldo: {self.balance_check_interval * self.balance_fail_threshold}s")
@@ -99,22 +100,21 @@ class RefreshManager:
 
     def update_explosion_time(self):
         """Atualiza timestamp da última explosão detectada"""
-        self.last_explosion_time = datetime.now()
-        self.last_activity_time = datetime.now()
+        self.last_explosion_time = self.last_activity_time = time.monotonic()
 
     def get_time_since_last_explosion(self) -> float:
         """Retorna tempo em segundos desde a última explosão"""
-        return (datetime.now() - self.last_explosion_time).total_seconds()
+        return time.monotonic() - self.last_explosion_time
 
     def update_multiplier_status(self, multiplier_value: Optional[float]):
         """Atualiza status do multiplicador para detectar travamento"""
         if multiplier_value is not None:
-            self.last_activity_time = datetime.now()
+            self.last_activity_time = time.monotonic()
             self.multiplier_update_count += 1
 
             if self.last_multiplier_value != multiplier_value:
                 self.last_multiplier_value = multiplier_value
-                self.last_multiplier_change_time = datetime.now()
+                self.last_multiplier_change_time = time.monotonic()
 
     def capture_screen_for_analysis(self) -> Optional[np.ndarray]:
         """Captura tela para análise de tela preta"""
@@ -140,10 +140,10 @@ class RefreshManager:
 
             if is_black:
                 if self.black_screen_start_time is None:
-                    self.black_screen_start_time = datetime.now()
+                    self.black_screen_start_time = time.monotonic()
                     print(f"{Fore.YELLOW}🖤 Tela preta detectada! Brilho: {mean_brightness:.1f}")
 
-                time_black = (datetime.now() - self.black_screen_start_time).total_seconds()
+                time_black = time.monotonic() - self.black_screen_start_time
                 return time_black >= self.black_screen_timeout
             else:
                 self.black_screen_start_time = None
@@ -158,7 +158,7 @@ class RefreshManager:
         if self.last_activity_time is None:
             return False
 
-        time_inactive = (datetime.now() - self.last_activity_time).total_seconds()
+        time_inactive = time.monotonic() - self.last_activity_time
         return time_inactive >= self.black_screen_timeout
 
     def is_anomaly_detected(self):
@@ -228,7 +228,7 @@ class RefreshManager:
                 self.refresh_history = self.refresh_history[-50:]
 
             # Reset timers
-            self.last_explosion_time = datetime.now()
+            self.last_explosion_time = time.monotonic()
             self.balance_fail_count = 0
 
             print(f"{Fore.GREEN}✅ F5 Refresh executado com sucesso!")
@@ -418,8 +418,8 @@ class RefreshManager:
                 self.refresh_history = self.refresh_history[-50:]
 
             # Reset timers
-            self.last_explosion_time = datetime.now()
-            self.last_restart_time = datetime.now()
+            self.last_explosion_time = time.monotonic()
+            self.last_restart_time = time.monotonic()
             self.preventive_restart_pending = False
             self.balance_fail_count = 0
 
@@ -450,7 +450,7 @@ class RefreshManager:
     # ==================== VERIFICAÇÕES PREVENTIVAS ====================
     def check_preventive_restart(self) -> bool:
         """Verifica se passou tempo suficiente para restart preventivo do Firefox"""
-        time_since_restart = (datetime.now() - self.last_restart_time).total_seconds()
+        time_since_restart = time.monotonic() - self.last_restart_time
         if time_since_restart >= self.preventive_restart_interval:
             self.preventive_restart_pending = True
             return True
@@ -469,7 +469,7 @@ class RefreshManager:
 
     def get_time_since_last_restart(self) -> float:
         """Retorna tempo em segundos desde o último restart do Firefox"""
-        return (datetime.now() - self.last_restart_time).total_seconds()
+        return time.monotonic() - self.last_restart_time
 
     # ==================== MONITORAMENTO ====================
     def monitor_loop(self):
@@ -508,7 +508,7 @@ class RefreshManager:
 
                     # Reset dos timers
                     self.black_screen_start_time = None
-                    self.last_activity_time = datetime.now()
+                    self.last_activity_time = time.monotonic()
                     self.balance_fail_count = 0
 
                     time.sleep(5)
@@ -584,6 +584,7 @@ class RefreshManager:
     def get_status(self) -> dict:
         """Retorna status atual do sistema"""
         time_since_explosion = self.get_time_since_last_explosion()
+        agora = datetime.now()
 
         return {
             'monitoring_enabled': self.monitoring_enabled,
@@ -592,8 +593,8 @@ class RefreshManager:
             'anomaly_detected': self.is_anomaly_detected(),
             'time_until_refresh': max(0, self.auto_refresh_timeout - time_since_explosion),
             'stats': self.stats.copy(),
-            'recent_refreshes': len([r for r in self.refresh_history if
-                                   (datetime.now() - r.timestamp).total_seconds() < 3600])
+            'recent_refreshes': sum(1 for r in self.refresh_history if
+                                    (agora - r.timestamp).total_seconds() < 3600)
         }
 
     def get_refresh_history(self, limit: int = 10) -> list:
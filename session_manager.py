@@ -9,7 +9,7 @@ Integra o DatabaseManager ao sistema Kamikaze
 import time
 import uuid
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from colorama import Fore, init
 from database_manager import DatabaseManager
 
@@ -55,8 +55,8 @@ class SessionManager:
     # ===== MÉTODOS PARA RODADAS =====
     
     def save_multiplier(self, multiplier: float, regime: str = None, 
-                       score: float = None, capture_quality: str = "OK") -> int:
-        """Salva multiplicador capturado"""
+                       score: float = None, capture_quality: str = "OK") -> Optional[int]:
+        """Salva multiplicador capturado (gravação em lote: retorna None, sem ID imediato)"""
         try:
             round_id = self.db.save_round(
                 multiplier=multiplier,
@@ -183,6 +183,23 @@ class SessionManager:
         except Exception as e:
             self.log_system("ERROR", "SessionManager", 
                           f"Erro ao atualizar resultado: {e}")
+
+    def update_bet_results(self, rows: List[tuple]):
+        """Atualiza resultado de várias apostas (todos os slots) num único commit
+
+        rows: tuplas (bet_id, actual_multiplier, result, profit_loss, working_balance_after)
+        """
+        try:
+            self.db.update_bet_results(rows)
+
+            for bet_id, actual_multiplier, result, profit_loss, _ in rows:
+                profit_text = f"+R$ {profit_loss:.2f}" if profit_loss > 0 else f"-R$ {abs(profit_loss):.2f}"
+                self.log_system("INFO", "BetResult",
+                              f"Aposta {bet_id}: {result} @ {actual_multiplier}x → {profit_text}")
+
+        except Exception as e:
+            self.log_system("ERROR", "SessionManager",
+                          f"Erro ao atualizar resultado: {e}")
     
     # ===== MÉTODOS DE DEBUG E LOG =====
     
@@ -323,6 +340,7 @@ class SessionManager:
             self.log_system("INFO", "SessionManager", 
                           f"Total: {final_stats.get('rounds_captured', 0)} rodadas, " +
                           f"{final_stats.get('bets_executed', 0)} apostas")
+            self.db.flush()
             
             print(f"\n{Fore.CYAN}📊 SESSÃO ENCERRADA")
             print(f"{Fore.WHITE}ID: {self.session_id}")
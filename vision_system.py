@@ -16,6 +16,7 @@ import json
 import time
 import logging
 import random
+import threading
 from collections import deque
 from typing import Optional, List, Dict, Tuple
 import re
@@ -71,6 +72,9 @@ class VisionSystem:
         self.round_start_time = None  # Quando viu 1.0x pela primeira vez
         self.max_mult_seen = 0.0  # Maior multiplicador visto na rodada atual
         
+        # Instancia mss por thread (mss nao e thread-safe); reaproveitada entre capturas
+        self._mss_local = threading.local()
+
         # Cache para templates
         self.template_cache = {}
         self.load_templates()
@@ -288,19 +292,27 @@ class VisionSystem:
 
         return None
 
+    def _get_sct(self):
+        """Retorna a instancia mss desta thread (criada na primeira captura)"""
+        sct = getattr(self._mss_local, 'sct', None)
+        if sct is None:
+            sct = self._mss_local.sct = mss.mss()
+        return sct
+
     def capture_region(self, region: Dict) -> Optional[np.ndarray]:
         """Captura região da tela usando mss"""
         try:
-            with mss.mss() as sct:
-                screenshot = sct.grab({
-                    "top": region['y'],
-                    "left": region['x'],
-                    "width": region['width'],
-                    "height": region['height']
-                })
-                return np.array(screenshot)
+            screenshot = self._get_sct().grab({
+                "top": region['y'],
+                "left": region['x'],
+                "width": region['width'],
+                "height": region['height']
+            })
+            return np.array(screenshot)
         except Exception as e:
             self.logger.error(f"Erro na captura: {e}")
+            # Descarta a instancia desta thread; a proxima captura cria outra
+            self._mss_local.sct = None
             return None
 
     def preprocess_for_ocr(self, img: np.ndarray, target_type: str = 'general') -> np.ndarray: